@@ -0,0 +1,228 @@
+"""
+로컬 가짜 카카오 API(FakeKakaoServer)를 대상으로 전체 수집 처리량을 측정하는 벤치마크.
+실제 일일 할당량을 쓰지 않고 수집 로직 변경 전/후 처리량을 비교할 때 사용.
+
+python -m collect.benchmark --brands 200 --latency 0.02 --workers 10
+python -m collect.benchmark --brands 200 --latency 0.02 --mode async --in-flight 200
+python -m collect.benchmark --brands 200 --latency 0.02 --error-rate 0.01 --stall-rate 0.002 --read-timeout 2 --hedge 95
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import resource
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from collect.fake_kakao_server import FakeKakaoLocal, FakeKakaoServer, make_synthetic_stores, make_synthetic_targets
+from collect.kakao_api import KakaoAPIManager
+
+
+def _peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux는 KB, macOS는 byte 단위
+    return peak / 1024 / 1024 if sys.platform == 'darwin' else peak / 1024
+
+
+def _prepare_inputs(work_dir, n_brands, guso_path, n_gu, n_keys, seed):
+    """
+    가상 가맹점 tsv / 시군구동 xlsx / api key 파일을 work_dir에 생성
+    """
+    target_df = make_synthetic_targets(n_brands, seed=seed)
+    target_path = os.path.join(work_dir, 'data.tsv')
+    target_df.to_csv(target_path, sep='\t', index=False)
+
+    guso_df = pd.read_excel(guso_path)
+    if n_gu:
+        # 구 단위로 잘라서 지역 수를 줄임 (빠른 반복 측정용)
+        gu_key = guso_df['SIDO_NM'] + ' ' + guso_df['SIGUNGU_NM'] + ' ' + guso_df['GU_NM'].fillna('')
+        keep = gu_key.drop_duplicates().iloc[:n_gu]
+        guso_df = guso_df[gu_key.isin(keep)].reset_index(drop=True)
+    bench_guso_path = os.path.join(work_dir, 'guso.xlsx')
+    guso_df.to_excel(bench_guso_path, index=False)
+
+    api_key_path = os.path.join(work_dir, 'api_keys.txt')
+    with open(api_key_path, 'w') as f:
+        f.write('\n'.join(f"benchkey{i:03d}" for i in range(n_keys)))
+
+    return target_df, guso_df, target_path, bench_guso_path, api_key_path
+
+
+def run_benchmark(
+    n_brands=200,
+    guso_path='./data/API_카카오_시군구동_20241217.xlsx',
+    n_gu=None,
+    n_keys=3,
+    quota_per_key=None,
+    latency=0.0,
+    jitter=0.0,
+    max_workers=10,
+    seed=0,
+    quiet=True,
+    mode='thread',
+    max_in_flight=200,
+    key_rate_per_sec=None,
+    search_mode='region',
+    sido_tier=True,
+    coverage_tolerance=None,
+    storage='csv',
+    error_rate=0.0,
+    stall_rate=0.0,
+    stall_seconds=30.0,
+    read_timeout=10.0,
+    hedge_percentile=None,
+):
+    """
+    가짜 서버를 띄우고 전체 수집을 실행한 뒤 측정 결과(dict) 반환
+    mode: 'thread' -> collect_stores_in_parallel, 'queue' -> collect_stores_queued, 'async' -> collect_stores_async
+    """
+    with tempfile.TemporaryDirectory() as work_dir:
+        target_df, guso_df, target_path, bench_guso_path, api_key_path = _prepare_inputs(
+            work_dir, n_brands, guso_path, n_gu, n_keys, seed
+        )
+        stores = make_synthetic_stores(target_df, guso_df, seed=seed, name_change=lambda name: KakaoAPIManager._name_change(None, name))
+        fake = FakeKakaoLocal(stores, quota_per_key=quota_per_key, latency=latency, jitter=jitter, seed=seed,
+                              error_rate=error_rate, stall_rate=stall_rate, stall_seconds=stall_seconds)
+
+        with FakeKakaoServer(fake) as server:
+            manager = KakaoAPIManager(
+                api_key_path=api_key_path,
+                target_path=target_path,
+                guso_path=bench_guso_path,
+                progress_file_path=os.path.join(work_dir, 'save_data'),
+                api_url=server.url,
+                key_rate_per_sec=key_rate_per_sec,
+                # 가짜 서버의 할당량은 초기화되지 않으므로 소진 시 대기하지 않고 중단
+                wait_on_exhaust=False,
+                search_mode=search_mode,
+                sido_tier=sido_tier,
+                coverage_tolerance=coverage_tolerance,
+                storage=storage,
+                read_timeout=read_timeout,
+                hedge_percentile=hedge_percentile,
+            )
+            out = io.StringIO() if quiet else sys.stdout
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(out):
+                if mode == 'async':
+                    manager.collect_stores_async(max_in_flight=max_in_flight)
+                elif mode == 'queue':
+                    manager.collect_stores_queued(max_workers=max_workers)
+                else:
+                    manager.collect_stores_in_parallel(max_workers=max_workers)
+            wall = time.perf_counter() - start
+
+        stats = fake.stats()
+        saved_rows = 0
+        saved_brands = 0
+        save_dir = os.path.join(work_dir, 'save_data')
+        if manager.store is not None:
+            manager.store.close()
+            done_brands = manager.store.done_brands()
+            saved_brands = len(done_brands)
+            saved_rows = sum(len(manager.store.load_brand(brand)) for brand in done_brands)
+        elif os.path.isdir(save_dir):
+            for name in os.listdir(save_dir):
+                saved_brands += 1
+                with open(os.path.join(save_dir, name), encoding='utf-8-sig') as f:
+                    saved_rows += max(sum(1 for _ in f) - 1, 0)
+        events = manager.metrics.snapshot()['events']
+
+    calls_per_brand = np.array(list(stats['brand_calls'].values()) or [0])
+    return {
+        'brands': n_brands,
+        'regions_dong': len(guso_df),
+        'mode': mode,
+        'search_mode': search_mode,
+        'sido_tier': sido_tier,
+        'coverage_tolerance': coverage_tolerance,
+        'storage': storage,
+        'concurrency': max_in_flight if mode == 'async' else max_workers,
+        'latency': latency,
+        'wall_time_sec': round(wall, 3),
+        'api_calls': stats['total_calls'],
+        'throttled_429': stats['throttled'],
+        'errors_503': stats['errors'],
+        'stalls': stats['stalls'],
+        'retries': events.get('retry', 0),
+        'hedged': events.get('hedged', 0),
+        'requests_per_sec': round(stats['total_calls'] / wall, 1) if wall > 0 else None,
+        'calls_per_brand_mean': round(float(calls_per_brand.mean()), 2),
+        'calls_per_brand_p50': float(np.percentile(calls_per_brand, 50)),
+        'calls_per_brand_p99': float(np.percentile(calls_per_brand, 99)),
+        'calls_per_brand_max': int(calls_per_brand.max()),
+        'true_stores': sum(len(v) for v in stores.values()),
+        'saved_rows': saved_rows,
+        'saved_brands': saved_brands,
+        'peak_rss_mb': round(_peak_rss_mb(), 1),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='가짜 카카오 API 기반 수집 처리량 벤치마크')
+    parser.add_argument('--brands', type=int, default=200, help='가상 브랜드 수')
+    parser.add_argument('--guso-path', default='./data/API_카카오_시군구동_20241217.xlsx')
+    parser.add_argument('--gu', type=int, default=None, help='사용할 구 개수 (기본: 전체)')
+    parser.add_argument('--keys', type=int, default=3, help='가상 API 키 개수')
+    parser.add_argument('--quota', type=int, default=None, help='키별 호출 한도 (초과 시 429)')
+    parser.add_argument('--latency', type=float, default=0.0, help='응답 지연(초)')
+    parser.add_argument('--jitter', type=float, default=0.0, help='응답 지연 랜덤 추가분 최대값(초)')
+    parser.add_argument('--workers', type=int, default=10)
+    parser.add_argument('--mode', choices=['thread', 'queue', 'async'], default='thread')
+    parser.add_argument('--key-rate', type=float, default=None, help='키별 초당 요청 제한 (기본: 제한 없음)')
+    parser.add_argument('--search-mode', choices=['region', 'quadtree'], default='region',
+                        help='45건 초과 브랜드 검색 방식 (구/동 목록 vs rect 영역 분할)')
+    parser.add_argument('--no-sido-tier', action='store_true', help='시도 검색 없이 바로 구/동 검색 (region 모드)')
+    parser.add_argument('--coverage-tolerance', type=float, default=None,
+                        help='지정 시 브랜드 매장 고유 id 수가 total_count x (1 - 값) 에 도달하면 남은 지역 검색 생략 (기본: 모든 지역 검색)')
+    parser.add_argument('--storage', choices=['csv', 'sqlite'], default='csv')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='503 응답 비율')
+    parser.add_argument('--stall-rate', type=float, default=0.0, help='응답이 stall-seconds 동안 멈추는 비율')
+    parser.add_argument('--stall-seconds', type=float, default=30.0)
+    parser.add_argument('--read-timeout', type=float, default=10.0, help='응답 대기 timeout(초)')
+    parser.add_argument('--hedge', type=float, default=None, help='hedging 기준 지연 백분위 (예: 95)')
+    parser.add_argument('--in-flight', type=int, default=200, help='async 모드 동시 요청 수')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--verbose', action='store_true', help='수집 로그 출력')
+    parser.add_argument('--json', dest='json_path', default=None, help='결과를 저장할 json 경로')
+    args = parser.parse_args(argv)
+
+    result = run_benchmark(
+        n_brands=args.brands,
+        guso_path=args.guso_path,
+        n_gu=args.gu,
+        n_keys=args.keys,
+        quota_per_key=args.quota,
+        latency=args.latency,
+        jitter=args.jitter,
+        max_workers=args.workers,
+        seed=args.seed,
+        quiet=not args.verbose,
+        mode=args.mode,
+        max_in_flight=args.in_flight,
+        key_rate_per_sec=args.key_rate,
+        search_mode=args.search_mode,
+        sido_tier=not args.no_sido_tier,
+        coverage_tolerance=args.coverage_tolerance,
+        storage=args.storage,
+        error_rate=args.error_rate,
+        stall_rate=args.stall_rate,
+        stall_seconds=args.stall_seconds,
+        read_timeout=args.read_timeout,
+        hedge_percentile=args.hedge,
+    )
+    for k, v in result.items():
+        print(f"{k:>22}: {v}")
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+    return result
+
+
+if __name__ == "__main__":
+    main()
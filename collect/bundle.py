@@ -0,0 +1,297 @@
+"""
+내부망 반입용 증분 번들 (save_data 전체 대신 지난 export 이후 추가/변경/삭제된 매장만).
+
+반출(외부망):  python -m collect.bundle export --src ./save_data/ --out ./export/
+반입(내부망):  python -m collect.bundle import ./export/delta_000002_20250120_093000.zip --db ./internal/places.sqlite
+
+번들(zip, deflate)은 컬럼별 json 배열(upsert/<컬럼>.json, delete/brand.json, delete/id.json)과 manifest.json 으로 구성.
+manifest 에 번호(seq), 행 수, 파일별 sha256 을 기록하고 번들 전체 sha256 은 옆의 .sha256 파일(sha256sum 형식)에 기록.
+반입은 seq 순서대로만 적용 (빠진 번들이 있으면 중단) -> 번들을 잃어버리면 export --full 로 전체 번들을 다시 만든다.
+"""
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import time
+import zipfile
+from datetime import datetime
+from glob import glob
+
+import numpy as np
+import pandas as pd
+
+from collect.store import PLACE_COLUMNS, PlaceStore
+
+BUNDLE_VERSION = 1
+KEY_COLUMNS = ['brand', 'id']
+BUNDLE_COLUMNS = ['brand'] + PLACE_COLUMNS
+# 지난 export 시작 시각보다 이만큼(초) 앞부터 다시 읽음.
+# PlaceStore writer 는 commit 전에 updated_at 을 찍으므로 export 도중 commit 된 행이 빠지지 않도록 (다시 읽은 행은 hash 로 제외)
+OVERLAP_SECONDS = 60
+
+
+def _sha256(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def _row_hashes(frame):
+    """
+    행 내용 hash (int64, 컬럼 전체를 한 번에 계산)
+    """
+    return pd.util.hash_pandas_object(frame[BUNDLE_COLUMNS], index=False).to_numpy().view(np.int64)
+
+
+class DeltaExporter:
+    """
+    수집 결과(save_data 의 places.sqlite 또는 브랜드별 csv)에서 지난 export 이후 바뀐 행만 번들로 저장.
+    export 상태(행별 hash, 번들 번호)는 state_path(SQLite)에 기록 -> 다음 export 는
+    places.sqlite 의 updated_at / csv 수정 시각이 지난 export 시작 - overlap_seconds 이후인 행만 읽고 hash 로 실제 변경 여부를 판단.
+    places.sqlite 는 upsert 만 하므로 삭제는 place_index_path(PlaceIndex)의 폐점(closed_at) 매장으로 판단
+    (인덱스가 없으면 places.sqlite 번들은 추가/변경만 담김).
+    """
+
+    def __init__(self, src_dir='./save_data/', state_path=None, overlap_seconds=OVERLAP_SECONDS, place_index_path=None):
+        self.src_dir = src_dir
+        self.overlap_seconds = overlap_seconds
+        self.db_path = os.path.join(src_dir, 'places.sqlite')
+        self.place_index_path = place_index_path or os.path.join(src_dir, 'place_index.sqlite')
+        self.state_path = state_path or os.path.join(src_dir, 'export_state.sqlite')
+        self.conn = sqlite3.connect(self.state_path, timeout=60)
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS exported (
+                brand TEXT NOT NULL,
+                id TEXT NOT NULL,
+                hash INTEGER NOT NULL,
+                PRIMARY KEY (brand, id)
+            )
+            """
+        )
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS export_log (
+                seq INTEGER PRIMARY KEY,
+                created_at REAL NOT NULL,
+                path TEXT NOT NULL,
+                upserts INTEGER NOT NULL,
+                deletes INTEGER NOT NULL,
+                full INTEGER NOT NULL
+            )
+            """
+        )
+        self.conn.commit()
+
+    def _last_export(self):
+        row = self.conn.execute("SELECT seq, created_at FROM export_log ORDER BY seq DESC LIMIT 1").fetchone()
+        return row or (0, 0.0)
+
+    def _changed_rows(self, since):
+        """
+        since 이후 갱신된 행 (DataFrame, BUNDLE_COLUMNS) + 삭제 후보 (DataFrame, brand / id)
+        """
+        if os.path.exists(self.db_path):
+            src = sqlite3.connect(self.db_path, timeout=60)
+            try:
+                live = "TRUE"
+                if os.path.exists(self.place_index_path):
+                    # 폐점 매장은 place 에 남아 있어도 삭제로 내보냄 (다시 보이면 closed_at 이 지워지고 updated_at 이 갱신됨)
+                    src.execute("ATTACH DATABASE ? AS pindex", (self.place_index_path,))
+                    live = ("NOT EXISTS (SELECT 1 FROM pindex.place_index AS p WHERE p.brand = place.brand "
+                            "AND p.id = place.id AND p.closed_at IS NOT NULL)")
+                changed = pd.read_sql_query(
+                    f"SELECT {', '.join(BUNDLE_COLUMNS)} FROM place WHERE updated_at > ? AND {live}", src, params=(since,)
+                )
+                # 삭제: export 상태에는 있고 place 에 없거나 폐점된 (brand, id)
+                src.execute("ATTACH DATABASE ? AS state", (self.state_path,))
+                removed = pd.read_sql_query(
+                    f"SELECT brand, id FROM state.exported EXCEPT SELECT brand, id FROM place WHERE {live}", src
+                )
+            finally:
+                src.close()
+            return changed.fillna(''), removed
+
+        # csv 저장소: 수정된 브랜드 파일만 읽음
+        files = {os.path.splitext(os.path.basename(path))[0]: path
+                 for path in glob(os.path.join(self.src_dir, '*.csv'))}
+        frames = []
+        for brand, path in files.items():
+            if os.path.getmtime(path) <= since:
+                continue
+            frame = pd.read_csv(path, dtype=str, keep_default_na=False).reindex(columns=PLACE_COLUMNS, fill_value='')
+            frame.insert(0, 'brand', brand)
+            frames.append(frame)
+        changed = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=BUNDLE_COLUMNS)
+        exported = pd.read_sql_query("SELECT brand, id FROM exported", self.conn)
+        # 파일이 없어진 브랜드 전체 + 다시 쓴 파일에서 빠진 행
+        touched = exported['brand'].isin(changed['brand'].unique())
+        gone = ~exported['brand'].isin(list(files))
+        current = pd.MultiIndex.from_frame(changed[KEY_COLUMNS])
+        missing = touched & ~pd.MultiIndex.from_frame(exported[KEY_COLUMNS]).isin(current)
+        return changed, exported[gone | missing].reset_index(drop=True)
+
+    def export(self, out_dir='./export/', full=False):
+        """
+        번들 하나 생성 -> 번들 경로 (바뀐 행이 없으면 None)
+        full=True: 지난 export 와 관계없이 전체 행을 번들로 (반입 쪽 초기화 / 번들 분실 시)
+        """
+        started = time.time()
+        seq, since = self._last_export()
+        seq += 1
+        since = 0.0 if full else max(since - self.overlap_seconds, 0.0)
+        changed, removed = self._changed_rows(since)
+        changed = changed.astype(str).drop_duplicates(KEY_COLUMNS, keep='last').reset_index(drop=True)
+        hashes = _row_hashes(changed)
+
+        # hash 가 같은 행(내용 변화 없이 다시 저장된 행)은 제외
+        previous = pd.read_sql_query("SELECT brand, id, hash FROM exported WHERE ?", self.conn, params=(not full,)) \
+            .set_index(KEY_COLUMNS)['hash']
+        keys = pd.MultiIndex.from_frame(changed[KEY_COLUMNS])
+        same = previous.reindex(keys, fill_value=0).to_numpy() == hashes
+        upserts = changed[~same].reset_index(drop=True)
+        upsert_hashes = hashes[~same]
+        if len(upserts) == 0 and len(removed) == 0:
+            print(f"[EXPORT] 지난 export(seq {seq - 1}) 이후 변경 없음")
+            return None
+
+        os.makedirs(out_dir, exist_ok=True)
+        name = f"delta_{seq:06d}_{datetime.fromtimestamp(started).strftime('%Y%m%d_%H%M%S')}.zip"
+        bundle_path = os.path.join(out_dir, name)
+        members = {f"upsert/{column}.json": upserts[column].tolist() for column in BUNDLE_COLUMNS}
+        members.update({f"delete/{column}.json": removed[column].astype(str).tolist() for column in KEY_COLUMNS})
+        payloads = {member: json.dumps(values, ensure_ascii=False).encode('utf-8') for member, values in members.items()}
+        manifest = {
+            'version': BUNDLE_VERSION,
+            'seq': seq,
+            'full': bool(full),
+            'created_at': started,
+            'columns': BUNDLE_COLUMNS,
+            'upserts': len(upserts),
+            'deletes': len(removed),
+            'files': {member: _sha256(payload) for member, payload in payloads.items()},
+        }
+
+        tmp_path = bundle_path + '.tmp'
+        with zipfile.ZipFile(tmp_path, 'w', compression=zipfile.ZIP_DEFLATED, compresslevel=9) as zf:
+            zf.writestr('manifest.json', json.dumps(manifest, ensure_ascii=False, indent=1))
+            for member, payload in payloads.items():
+                zf.writestr(member, payload)
+        os.replace(tmp_path, bundle_path)
+        with open(bundle_path, 'rb') as f:
+            digest = _sha256(f.read())
+        with open(bundle_path + '.sha256', 'w', encoding='utf-8') as f:
+            f.write(f"{digest}  {name}\n")
+
+        # 번들 파일을 다 쓴 뒤에만 export 상태 반영
+        with self.conn:
+            if full:
+                self.conn.execute("DELETE FROM exported")
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO exported (brand, id, hash) VALUES (?, ?, ?)",
+                zip(upserts['brand'], upserts['id'], upsert_hashes.tolist()),
+            )
+            self.conn.executemany(
+                "DELETE FROM exported WHERE brand = ? AND id = ?", zip(removed['brand'], removed['id'].astype(str))
+            )
+            self.conn.execute(
+                "INSERT INTO export_log (seq, created_at, path, upserts, deletes, full) VALUES (?, ?, ?, ?, ?, ?)",
+                (seq, started, bundle_path, len(upserts), len(removed), int(full)),
+            )
+        size_kb = os.path.getsize(bundle_path) / 1024
+        print(f"[EXPORT] {bundle_path} (seq {seq}) 추가/변경 {len(upserts)}건, 삭제 {len(removed)}건, "
+              f"{size_kb:.1f}KB, {time.time() - started:.1f}초")
+        return bundle_path
+
+
+def read_bundle(bundle_path):
+    """
+    번들 검증 후 (manifest, upsert DataFrame, delete DataFrame)
+    .sha256 파일이 있으면 번들 전체 hash, manifest 의 파일별 hash 를 모두 확인.
+    """
+    checksum_path = bundle_path + '.sha256'
+    if os.path.exists(checksum_path):
+        with open(checksum_path, encoding='utf-8') as f:
+            expected = f.read().split()[0]
+        with open(bundle_path, 'rb') as f:
+            if _sha256(f.read()) != expected:
+                raise ValueError(f"번들 checksum 불일치: {bundle_path}")
+
+    with zipfile.ZipFile(bundle_path) as zf:
+        manifest = json.loads(zf.read('manifest.json'))
+        if manifest['version'] != BUNDLE_VERSION:
+            raise ValueError(f"지원하지 않는 번들 버전: {manifest['version']}")
+        columns = {}
+        for member, digest in manifest['files'].items():
+            payload = zf.read(member)
+            if _sha256(payload) != digest:
+                raise ValueError(f"번들 파일 checksum 불일치: {member}")
+            columns[member] = json.loads(payload)
+    upserts = pd.DataFrame({column: columns[f"upsert/{column}.json"] for column in manifest['columns']})
+    deletes = pd.DataFrame({column: columns[f"delete/{column}.json"] for column in KEY_COLUMNS})
+    return manifest, upserts, deletes
+
+
+def import_bundle(bundle_path, db_path='./internal/places.sqlite'):
+    """
+    번들을 내부망 places.sqlite (PlaceStore 와 같은 스키마)에 적용. seq 순서가 맞지 않으면 ValueError.
+    full 번들은 기존 행을 모두 지운 뒤 적용.
+    """
+    manifest, upserts, deletes = read_bundle(bundle_path)
+    dir_name = os.path.dirname(db_path)
+    if dir_name:
+        os.makedirs(dir_name, exist_ok=True)
+    conn = sqlite3.connect(db_path, timeout=60)
+    try:
+        PlaceStore._create_tables(conn)
+        conn.execute("CREATE TABLE IF NOT EXISTS import_log (seq INTEGER PRIMARY KEY, imported_at REAL NOT NULL, "
+                     "path TEXT NOT NULL)")
+        last_seq = conn.execute("SELECT COALESCE(MAX(seq), 0) FROM import_log").fetchone()[0]
+        if manifest['seq'] <= last_seq:
+            print(f"[IMPORT] {bundle_path} (seq {manifest['seq']}) 이미 반입됨")
+            return False
+        if not manifest['full'] and manifest['seq'] != last_seq + 1:
+            raise ValueError(f"번들 순서 불일치: 마지막 반입 seq {last_seq}, 이번 seq {manifest['seq']} "
+                             f"(중간 번들을 먼저 반입하거나 export --full 번들 사용)")
+
+        names = ', '.join(BUNDLE_COLUMNS)
+        marks = ', '.join('?' for _ in BUNDLE_COLUMNS)
+        updates = ', '.join(f"{c} = excluded.{c}" for c in PLACE_COLUMNS if c != 'id')
+        now = time.time()
+        with conn:
+            if manifest['full']:
+                conn.execute("DELETE FROM place")
+            conn.executemany(
+                f"INSERT INTO place ({names}, updated_at) VALUES ({marks}, ?) "
+                f"ON CONFLICT(brand, id) DO UPDATE SET {updates}, updated_at = excluded.updated_at",
+                [(*row, now) for row in upserts.itertuples(index=False, name=None)],
+            )
+            conn.executemany("DELETE FROM place WHERE brand = ? AND id = ?", deletes.itertuples(index=False, name=None))
+            conn.execute("INSERT INTO import_log (seq, imported_at, path) VALUES (?, ?, ?)",
+                         (manifest['seq'], now, os.path.basename(bundle_path)))
+    finally:
+        conn.close()
+    print(f"[IMPORT] {bundle_path} (seq {manifest['seq']}) 추가/변경 {len(upserts)}건, 삭제 {len(deletes)}건 적용")
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description='내부망 반입용 증분 번들 생성 / 적용')
+    sub = parser.add_subparsers(dest='command', required=True)
+    export_parser = sub.add_parser('export', help='지난 export 이후 변경분 번들 생성 (외부망)')
+    export_parser.add_argument('--src', default='./save_data/')
+    export_parser.add_argument('--out', default='./export/')
+    export_parser.add_argument('--full', action='store_true', help='전체 행 번들 (반입 쪽 초기화 / 번들 분실 시)')
+    import_parser = sub.add_parser('import', help='번들 적용 (내부망), 여러 개면 seq 순서대로')
+    import_parser.add_argument('bundles', nargs='+')
+    import_parser.add_argument('--db', default='./internal/places.sqlite')
+    args = parser.parse_args()
+
+    if args.command == 'export':
+        DeltaExporter(args.src).export(args.out, full=args.full)
+    else:
+        for bundle_path in sorted(args.bundles, key=os.path.basename):
+            import_bundle(bundle_path, args.db)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+import json
+import os
+import threading
+import time
+
+
+class CheckpointJournal:
+    """
+    브랜드 수집 도중의 진행 상황을 남기는 append-only 저널.
+    완료된 (검색어, page[, rect]) 요청과 응답을 브랜드별 jsonl 파일에 한 줄씩 추가하고,
+    재시작 시 같은 요청은 API 대신 저널의 응답을 재사용해 마지막으로 끝난 지역부터 이어서 수집한다.
+    브랜드 결과가 저장되면 해당 브랜드의 저널은 삭제.
+    수집이 실패해 남은 저널은 max_age(초)가 지난 응답부터 재사용하지 않음 (며칠 뒤 재수집에서 오래된 응답이 새 결과로 저장되지 않도록).
+    """
+
+    def __init__(self, path='./journal/', max_age=3600 * 20):
+        self.path = path
+        self.max_age = max_age
+        os.makedirs(path, exist_ok=True)
+        self.lock = threading.Lock()
+        self.entries = {}
+        self.replayed = 0
+
+    def _file(self, store_name):
+        return os.path.join(self.path, store_name + '.jsonl')
+
+    def _load(self, store_name):
+        """
+        브랜드 저널을 메모리로 읽기. self.lock 을 잡은 상태에서 호출.
+        """
+        entries = {}
+        file_path = self._file(store_name)
+        if os.path.exists(file_path) and os.path.getmtime(file_path) < time.time() - self.max_age:
+            # 마지막 기록도 max_age 보다 오래됨 -> 전체 폐기
+            print(f"[RESUME] {store_name} 저널이 오래되어 삭제")
+            os.remove(file_path)
+        if os.path.exists(file_path):
+            file_time = os.path.getmtime(file_path)
+            with open(file_path, encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        row = json.loads(line)
+                    except ValueError:
+                        # 중단 시점에 잘린 마지막 줄은 무시
+                        continue
+                    # 기록 시각이 없는 이전 형식은 파일 수정 시각 기준
+                    entries[(row['query'], row['page'], row.get('rect'))] = (row.get('at', file_time), row['response'])
+            expired = time.time() - self.max_age
+            entries = {key: value for key, value in entries.items() if value[0] >= expired}
+            if entries:
+                print(f"[RESUME] {store_name} 저널 {len(entries)}건 재사용")
+        self.entries[store_name] = entries
+        return entries
+
+    def lookup(self, store_name, keyword, page, rect=None):
+        """
+        저널에 남아있는 응답 반환. 없으면 None
+        """
+        with self.lock:
+            entries = self.entries.get(store_name)
+            if entries is None:
+                entries = self._load(store_name)
+            entry = entries.get((keyword, page, rect))
+            if entry is None:
+                return None
+            at, result = entry
+            if at < time.time() - self.max_age:
+                # 상시 실행 중 메모리에 남아 있던 오래된 응답
+                return None
+            self.replayed += 1
+            return result
+
+    def record(self, store_name, keyword, page, response, rect=None):
+        row = {'query': keyword, 'page': page, 'at': time.time(), 'response': response}
+        if rect is not None:
+            row['rect'] = rect
+        line = json.dumps(row, ensure_ascii=False)
+        with self.lock:
+            # 이번 실행에서 받은 응답은 파일에만 기록 (메모리에 쌓아두지 않음)
+            with open(self._file(store_name), 'a', encoding='utf-8') as f:
+                f.write(line + '\n')
+
+    def complete(self, store_name):
+        """
+        브랜드 저장 완료 -> 저널 삭제
+        """
+        with self.lock:
+            self.entries.pop(store_name, None)
+            file_path = self._file(store_name)
+            if os.path.exists(file_path):
+                os.remove(file_path)
@@ -0,0 +1,295 @@
+import hashlib
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+import pandas as pd
+
+PAGE_SIZE = 15
+MAX_PAGEABLE = 45
+THROTTLED_BODY = '{"errorType":"RequestThrottled","message":"API limit has been exceeded."}'
+
+# 대한민국 대략적인 경위도 범위 (x: 경도, y: 위도)
+KOREA_BOUNDS = (124.5, 33.0, 131.0, 38.7)
+
+
+def _region_center(region_key):
+    """
+    지역명으로부터 항상 같은 (x, y) 중심 좌표를 만든다.
+    """
+    digest = hashlib.md5(region_key.encode('utf-8')).digest()
+    min_x, min_y, max_x, max_y = KOREA_BOUNDS
+    rx = int.from_bytes(digest[:4], 'big') / 2 ** 32
+    ry = int.from_bytes(digest[4:8], 'big') / 2 ** 32
+    return min_x + (max_x - min_x) * rx, min_y + (max_y - min_y) * ry
+
+
+def make_synthetic_targets(n_brands=200, seed=0):
+    """
+    data/data.tsv 와 같은 컬럼 구조의 가상 가맹점 목록 생성
+    """
+    rng = random.Random(seed)
+    upjong = ['한식', '기타 외식', '커피', '치킨', '분식', '일식', '중식', '피자', '제과제빵', '주점']
+    rows = []
+    for i in range(n_brands):
+        year = rng.randint(2005, 2024)
+        rows.append({
+            '번호': n_brands - i,
+            '상호': f"(주)가상상호{i:05d}",
+            '영업표지': f"가상브랜드{i:05d}",
+            '대표자': '홍길동',
+            '등록번호': f"{year}{i:04d}",
+            '최초등록일': f"{year}.{rng.randint(1, 12):02d}.{rng.randint(1, 28):02d}",
+            '업종': rng.choice(upjong),
+        })
+    return pd.DataFrame(rows)
+
+
+def make_synthetic_stores(target_df, guso_df, seed=0, big_brand_ratio=0.05, mid_brand_ratio=0.2, name_change=None):
+    """
+    가맹점 목록 + 시군구동 데이터를 기반으로 브랜드별 가상 매장(document) 목록 생성.
+    대부분의 브랜드는 소수 매장, 일부 브랜드만 전국 단위 대형 체인이 되도록 분포를 맞춘다.
+    name_change: 영업표지 -> 검색어 변환 함수 (KakaoAPIManager._name_change 와 동일하게 맞출 때 사용)
+    """
+    rng = random.Random(seed)
+    regions = []
+    for _, row in guso_df.iterrows():
+        sigungu = row['SIGUNGU_NM']
+        gu = row['GU_NM'] if type(row['GU_NM']) == str else None
+        parts = [row['SIDO_NM'], sigungu] + ([gu] if gu else []) + [row['DONG_NM']]
+        regions.append(' '.join(parts))
+
+    # 지역별 상권 밀도 (일부 지역에 매장이 몰리도록)
+    weights = [rng.paretovariate(1.5) for _ in regions]
+
+    stores = {}
+    next_id = 10000000
+    for raw_name in target_df['영업표지']:
+        brand = name_change(raw_name) if name_change else str(raw_name)
+        p = rng.random()
+        if p < big_brand_ratio:
+            n_store = rng.randint(200, 2000)
+        elif p < big_brand_ratio + mid_brand_ratio:
+            n_store = rng.randint(16, 200)
+        else:
+            n_store = rng.randint(0, 15)
+
+        docs = []
+        for region in rng.choices(regions, weights=weights, k=n_store):
+            cx, cy = _region_center(region)
+            next_id += 1
+            docs.append({
+                'address_name': f"{region} {rng.randint(1, 999)}-{rng.randint(1, 30)}",
+                'category_group_code': 'FD6',
+                'category_group_name': '음식점',
+                'category_name': '음식점 > 가상',
+                'distance': '',
+                'id': str(next_id),
+                'phone': f"02-{rng.randint(100, 9999)}-{rng.randint(1000, 9999)}",
+                'place_name': f"{brand} {region.split(' ')[-1]}점",
+                'place_url': f"http://place.map.kakao.com/{next_id}",
+                'road_address_name': '',
+                'x': f"{cx + rng.uniform(-0.02, 0.02):.6f}",
+                'y': f"{cy + rng.uniform(-0.02, 0.02):.6f}",
+            })
+        stores[brand] = docs
+    return stores
+
+
+class FakeKakaoLocal:
+    """
+    https://dapi.kakao.com/v2/local/search/keyword.json 의 로컬 대체 구현.
+    query(브랜드 + 지역), page, rect 파라미터와 meta.total_count / same_name 필드,
+    페이지당 15건 / 최대 45건 제한, 키별 할당량 초과 시 429 RequestThrottled 응답, 응답 지연을 흉내낸다.
+    error_rate / stall_rate 로 일시적 503 응답과 멈춘 연결도 흉내낼 수 있다.
+    """
+
+    def __init__(self, stores, quota_per_key=None, latency=0.0, jitter=0.0, seed=0,
+                 error_rate=0.0, stall_rate=0.0, stall_seconds=30.0):
+        self.stores = stores
+        self.quota_per_key = quota_per_key
+        self.latency = latency
+        self.jitter = jitter
+        # 장애 흉내: error_rate 비율로 503 응답, stall_rate 비율로 stall_seconds 동안 응답 지연
+        self.error_rate = error_rate
+        self.stall_rate = stall_rate
+        self.stall_seconds = stall_seconds
+        self.rng = random.Random(seed)
+
+        self.lock = threading.Lock()
+        self.key_usage = {}
+        self.brand_calls = {}
+        self.total_calls = 0
+        self.throttled = 0
+        self.errors = 0
+        self.stalls = 0
+
+    def _match(self, brand, region_tokens, rect):
+        docs = self.stores.get(brand, [])
+        if region_tokens:
+            docs = [d for d in docs if all(t in d['address_name'] for t in region_tokens)]
+        if rect:
+            min_x, min_y, max_x, max_y = rect
+            docs = [d for d in docs if min_x <= float(d['x']) < max_x and min_y <= float(d['y']) < max_y]
+        return docs
+
+    def search(self, query, page=1, rect=None):
+        """
+        검색 결과 JSON(dict) 반환
+        """
+        tokens = query.split()
+        # 브랜드명에 공백이 있을 수 있으므로 가장 긴 브랜드명 prefix 를 찾는다
+        split_at = next((i for i in range(len(tokens), 0, -1) if ' '.join(tokens[:i]) in self.stores), 1)
+        brand = ' '.join(tokens[:split_at])
+        region_tokens = tokens[split_at:]
+        docs = self._match(brand, region_tokens, rect)
+
+        total_count = len(docs)
+        pageable_count = min(total_count, MAX_PAGEABLE)
+        start = (page - 1) * PAGE_SIZE
+        end = min(page * PAGE_SIZE, pageable_count)
+        page_docs = docs[start:end] if start < pageable_count else []
+
+        with self.lock:
+            self.brand_calls[brand] = self.brand_calls.get(brand, 0) + 1
+
+        return {
+            'documents': [dict(d) for d in page_docs],
+            'meta': {
+                'is_end': end >= pageable_count,
+                'pageable_count': pageable_count,
+                'same_name': {
+                    'keyword': brand,
+                    'region': [],
+                    'selected_region': ' '.join(region_tokens),
+                },
+                'total_count': total_count,
+            },
+        }
+
+    def handle(self, params, auth):
+        """
+        HTTP 요청 한 건 처리 -> (status, body)
+        """
+        delay = self.latency + (self.rng.uniform(0, self.jitter) if self.jitter else 0.0)
+        with self.lock:
+            fault = self.rng.random()
+            if fault < self.stall_rate:
+                self.stalls += 1
+                delay += self.stall_seconds
+            elif fault < self.stall_rate + self.error_rate:
+                self.errors += 1
+                return 503, json.dumps({'errorType': 'ServiceUnavailable', 'message': 'temporarily unavailable'})
+        if delay > 0:
+            time.sleep(delay)
+
+        with self.lock:
+            self.total_calls += 1
+            used = self.key_usage.get(auth, 0)
+            if self.quota_per_key is not None and used >= self.quota_per_key:
+                self.throttled += 1
+                return 429, THROTTLED_BODY
+            self.key_usage[auth] = used + 1
+
+        query = params.get('query', [''])[0]
+        try:
+            page = int(params.get('page', ['1'])[0])
+        except ValueError:
+            page = 0
+        if not query or not 1 <= page <= MAX_PAGEABLE:
+            return 400, json.dumps({'errorType': 'InvalidArgument', 'message': 'invalid query or page'})
+
+        rect = None
+        if 'rect' in params:
+            try:
+                rect = tuple(float(v) for v in params['rect'][0].split(','))
+            except ValueError:
+                return 400, json.dumps({'errorType': 'InvalidArgument', 'message': 'invalid rect'})
+        return 200, json.dumps(self.search(query, page, rect), ensure_ascii=False)
+
+    def stats(self):
+        with self.lock:
+            return {
+                'total_calls': self.total_calls,
+                'throttled': self.throttled,
+                'errors': self.errors,
+                'stalls': self.stalls,
+                'key_usage': dict(self.key_usage),
+                'brand_calls': dict(self.brand_calls),
+            }
+
+
+def _make_handler(fake):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        # keep-alive 연결에서 헤더/본문이 따로 전송되어 생기는 Nagle 지연 방지
+        disable_nagle_algorithm = True
+        wbufsize = -1
+
+        def do_GET(self):
+            parsed = urlparse(self.path)
+            if parsed.path != '/v2/local/search/keyword.json':
+                status, body = 404, '{"errorType":"NotFound","message":"not found"}'
+            else:
+                status, body = fake.handle(parse_qs(parsed.query), self.headers.get('Authorization', ''))
+            payload = body.encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json;charset=UTF-8')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def handle(self):
+            # 클라이언트가 응답 전에 끊은 연결(취소된 hedge 요청 등)은 traceback 없이 무시
+            try:
+                super().handle()
+            except (ConnectionResetError, BrokenPipeError):
+                pass
+
+        def finish(self):
+            try:
+                super().finish()
+            except (ConnectionResetError, BrokenPipeError):
+                pass
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+class FakeKakaoServer:
+    """
+    FakeKakaoLocal 을 백그라운드 스레드 HTTP 서버로 띄운다.
+    with FakeKakaoServer(fake) as server:
+        manager = KakaoAPIManager(api_url=server.url, ...)
+    """
+
+    def __init__(self, fake, host='127.0.0.1', port=0):
+        self.fake = fake
+        self.httpd = ThreadingHTTPServer((host, port), _make_handler(fake))
+        self.httpd.daemon_threads = True
+        self.thread = None
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/v2/local/search/keyword.json"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
@@ -1,14 +1,41 @@
 import requests
 import pandas as pd
 import os
+import json
+import asyncio
+import aiohttp
+from datetime import date
 from glob import glob
-import re
 import threading
+import time
 import concurrent.futures
 from tqdm import tqdm
-import numpy as np
 
 from collect.util import load_api_key
+from collect.scheduler import RegionTaskScheduler
+from collect.response_cache import ResponseCache
+from collect.checkpoint import CheckpointJournal
+from collect.key_pool import APIKeyPool
+from collect.region_history import RegionHistory
+from collect.store import PlaceStore, PLACE_COLUMNS
+from collect.pipeline import DocumentStream, iter_documents
+from collect.normalize import normalize_name, build_query_table
+from collect.region_index import load_region_index
+from collect.place_index import PlaceIndex
+from collect.metrics import Metrics
+from collect.retry import RetryPolicy
+from collect.work_queue import BrandWorkQueue, shard_keys
+from collect.priority import BrandPriority, DAY
+from collect.relevance import DEFAULT_THRESHOLD, RelevanceFilter, relevance_scores
+
+# 할당량 초과 응답 본문
+THROTTLED_BODY = '{"errorType":"RequestThrottled","message":"API limit has been exceeded."}'
+# 재시도 대상 네트워크 오류 (timeout 포함)
+NETWORK_ERRORS = (requests.ConnectionError, requests.Timeout)
+ASYNC_NETWORK_ERRORS = (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError, asyncio.TimeoutError)
+
+# 대한민국 전체를 덮는 검색 영역 (min_x, min_y, max_x, max_y) - quadtree 검색의 시작 영역
+KOREA_RECT = (124.5, 33.0, 131.0, 38.7)
 
 
 class KakaoAPIManager:
@@ -18,15 +45,105 @@ class KakaoAPIManager:
         target_path='./data/data.tsv',
         guso_path='./data/API_카카오_시군구동_20241217.xlsx',
         progress_file_path="./save_data/",
+        api_url="https://dapi.kakao.com/v2/local/search/keyword.json",
+        cache_path=None,
+        cache_ttl=3600 * 20,
+        cache_max_bytes=512 * 1024 * 1024,
+        journal_path=None,
+        daily_quota=100000,
+        key_rate_per_sec=10.0,
+        key_usage_path=None,
+        wait_on_exhaust=True,
+        search_mode='region',
+        sido_tier=True,
+        coverage_tolerance=None,
+        sweep_chunk_size=30,
+        region_history_path=None,
+        empty_recheck_days=7,
+        recrawl=False,
+        storage='csv',
+        place_index_path=None,
+        metrics_path=None,
+        connect_timeout=3.05,
+        read_timeout=10.0,
+        max_retries=4,
+        retry_budget=1000,
+        hedge_percentile=None,
+        key_shard=None,
+        relevance_threshold=None,
+        relevance_mode='drop',
+        relevance_patterns=None,
     ):
         self._load_data(api_key_path, target_path, guso_path)
-        self.api_index = 0
-        self.headers = {"Authorization": f"KakaoAK {self.api_keys[self.api_index]}"}
-        self.counts = 0
+        # key_shard=(워커 번호, 워커 수) 지정 시 API 키를 나눠 이 워커 몫만 사용 (여러 프로세스가 같은 키를 쓰지 않음)
+        if key_shard is not None:
+            worker_index, n_workers = key_shard
+            self.api_keys = shard_keys(self.api_keys, worker_index, n_workers)
+            if key_usage_path:
+                # 사용량 파일도 워커별로 (프로세스끼리 덮어쓰지 않도록)
+                root, ext = os.path.splitext(key_usage_path)
+                key_usage_path = f"{root}.{worker_index}{ext}"
+        self.api_url = api_url
+        # cache_path 지정 시 (검색어, page) 응답을 SQLite 파일에 캐시
+        self.cache = ResponseCache(cache_path, ttl=cache_ttl, max_bytes=cache_max_bytes) if cache_path else None
+        # journal_path 지정 시 브랜드 수집 도중 완료된 요청을 기록 -> 중단 후 재시작 시 이어서 수집 (cache_ttl 이 지난 응답은 재사용 안 함)
+        self.journal = CheckpointJournal(journal_path, max_age=cache_ttl) if journal_path else None
+        # 모든 키에 요청을 분산 + 키별 초당 제한 / 일일 사용량 기록, 모두 소진 시 초기화 시각까지 대기
+        self.key_pool = APIKeyPool(
+            self.api_keys,
+            daily_quota=daily_quota,
+            rate_per_sec=key_rate_per_sec,
+            usage_path=key_usage_path,
+            wait_on_exhaust=wait_on_exhaust,
+        )
+        # 키별 요청 수 / 지연 히스토그램 / 브랜드별 비용 (metrics_path 지정 시 json + .prom 파일로 주기적 저장)
+        self.metrics = Metrics(metrics_path)
+        # 요청 timeout / 5xx, 네트워크 오류 재시도(실행 전체 retry_budget) / hedge_percentile 지정 시 느린 요청 중복 전송
+        self.retry = RetryPolicy(
+            connect_timeout=connect_timeout,
+            read_timeout=read_timeout,
+            max_retries=max_retries,
+            retry_budget=retry_budget,
+            hedge_percentile=hedge_percentile,
+        )
+        # hedge 전송용 스레드 풀은 처음 hedge 할 때 생성 (save_lock 과 별도 lock -> 저장 중에도 hedge 가 기다리지 않음)
+        self._hedge_pool = None
+        self._hedge_lock = threading.Lock()
         self.progress_file_path = progress_file_path
+        # storage='sqlite' 면 브랜드별 csv 대신 progress_file_path/places.sqlite 에 (brand, id) upsert (별도 writer 스레드)
+        self.store = PlaceStore(os.path.join(progress_file_path, 'places.sqlite')) if storage == 'sqlite' else None
+        if self.store is not None:
+            self.metrics.set_gauge('store_queue_depth', self.store.queue.qsize)
+        # place_index_path 지정 시 전체 매장 id 인덱스 갱신 + 실행마다 신규/폐점/이전 매장 diff 저장
+        self.place_index = PlaceIndex(place_index_path) if place_index_path else None
+        # relevance_threshold 지정 시 브랜드명과 맞지 않는 검색 결과(이웃 가게, 지역명만 일치 등)를 저장 전에
+        # 버리거나(drop) progress_file_path/relevance/<브랜드>.csv 에 검토용으로 기록(flag)
+        self.relevance = RelevanceFilter(
+            relevance_threshold,
+            mode=relevance_mode,
+            patterns=relevance_patterns,
+            review_dir=os.path.join(progress_file_path, 'relevance'),
+        ) if relevance_threshold is not None else None
+        # 45건 초과 브랜드 검색 방식: 'region' (구/동 목록) / 'quadtree' (rect 영역 분할)
+        self.search_mode = search_mode
+        # region 검색에서 구 검색 전에 시도 검색 -> 0건 시도는 건너뛰고 45건 이하 시도는 바로 수집
+        self.sido_tier = sido_tier
+        # 시도/구/동 검색 중 브랜드 매장으로 판단되는 고유 id 수가 전국 total_count x (1 - coverage_tolerance) 에 도달하면
+        # 남은 지역 검색 중단 (기본 None: 끝까지, 중단 시 받지 못한 매장은 place_index 에서 폐점으로 기록될 수 있음)
+        # 지역은 예상 밀도 순으로 sweep_chunk_size 개씩 검색
+        self.coverage_tolerance = coverage_tolerance
+        self.sweep_chunk_size = sweep_chunk_size
+        # region_history_path 지정 시 지난 수집의 지역별 total_count 를 기준으로 결과가 있던 지역만 재검색
+        self.region_history = RegionHistory(region_history_path) if region_history_path else None
+        self.empty_recheck_days = empty_recheck_days
+        # recrawl=True 면 이미 저장된 브랜드도 다시 수집 (일일 갱신)
+        self.recrawl = recrawl
 
-        self.api_key_lock = threading.Lock()
         self.save_lock = threading.Lock()
+        # collect_stores_leased 실행 중 (작업 큐, worker_id) -> 저장이 끝난 브랜드를 큐에서 완료 처리
+        self._lease = None
+        # 스레드별 requests.Session (keep-alive 연결 재사용)
+        self._local = threading.local()
 
         self.saved_progress = self._load_progress()
 
@@ -34,52 +151,30 @@ class KakaoAPIManager:
         self.api_keys = load_api_key(api_key_path)
         self.target_df = pd.read_csv(target_path, sep='\t')
 
-        guso = pd.read_excel(guso_path)
-        self.guso_index = {}
-        for i, row in guso.iterrows():
-            gu = row['SIGUNGU_NM'] + '' if type(row['GU_NM']) != str else ' ' + row['GU_NM']
-            dong = row['DONG_NM']
-            sido = row['SIDO_NM']
-            if gu in self.guso_index:
-                self.guso_index[gu]['dong'].append(f"{sido} {gu} {dong}")
-            else:
-                self.guso_index[gu] = {
-                    'only_gu': row['SIGUNGU_NM'] if type(row['GU_NM']) != str else ' ' + row['GU_NM'],
-                    'gu': f"{sido} {gu}",
-                    'dong': [f"{sido} {gu} {dong}"]
-                }
-
-    import re
+        # 시군구동 xlsx -> 지역 인덱스 (xlsx hash 기준 캐시, 파일이 바뀐 경우만 다시 생성)
+        self.region_index = load_region_index(guso_path)
+        self.guso_index = self.region_index['gu']
+        self.sido_index = self.region_index['sido_gu']
+        # 지표용 검색어 분류 (시도 / 구 검색어 / 그 외 지역은 동). 구는 시도별 목록(sido_gu)과 기존 guso_index 검색어 모두
+        self._sido_queries = set(self.sido_index)
+        self._gu_queries = {value['gu'].strip() for value in self.guso_index.values()} | \
+            {value['gu'].strip() for gus in self.sido_index.values() for value in gus}
 
     def _name_change(self, name):
-        # Step 1: 괄호 () 안의 내용 추출
-        name = name.replace('(주)','')
-        match = re.search(r"\(([^)]+)\)", name)
-        if match:
-            inside_bracket = match.group(1)  # 괄호 안 텍스트
-            before_bracket_match = re.search(r"(\S+)\s*\([^)]*\)", name)
-
-            if before_bracket_match:
-                before_bracket = before_bracket_match.group(1)  # 괄호 앞 단어
-
-                # 영어 개수 비교
-                before_eng_count = sum(1 for c in before_bracket if c.isalpha())
-                inside_eng_count = sum(1 for c in inside_bracket if c.isalpha())
-
-                # 영어가 더 많은 쪽을 제거하고, 영어가 적은 쪽을 유지
-                if inside_eng_count > before_eng_count:
-                    name = name.replace(f"({inside_bracket})", "").strip()
-                else:
-                    name = name.replace(before_bracket, "").replace(f"({inside_bracket})", inside_bracket).strip()
-
-        # Step 2: 한글, 숫자, 영어만 남기기
-        filtered_text = re.sub(r"[^가-힣0-9a-zA-Z\s]", "", name)
+        """
+        영업표지 -> 검색어. 괄호 앞/안 중 영어가 적은 쪽만 남기고 한글, 숫자, 영어만 남김
+        (전체 컬럼 변환은 collect.normalize.normalize_names)
+        """
+        return normalize_name(name)
 
-        return filtered_text
     def _save_progress(self, data, store_name):
         """
         수집한 데이터를 진행 상황에 저장.
         """
+        if self.store is not None:
+            self.store.save(store_name, data, on_saved=self._on_saved)
+            return
+
         save_path = os.path.join(self.progress_file_path, store_name + '.csv')
 
         with self.save_lock:
@@ -88,55 +183,119 @@ class KakaoAPIManager:
                 data.to_csv(save_path, index=False, encoding="utf-8-sig")
             else:
                 try:
-                    existing_data = pd.read_csv(save_path)
-                    updated_data = pd.concat([existing_data, data]).drop_duplicates(['id'])
+                    # 문자열로 읽어야 id 가 새 결과(문자열)와 같은 값으로 비교됨, 같은 id 는 새 결과로 갱신
+                    existing_data = pd.read_csv(save_path, dtype=str, keep_default_na=False)
+                    updated_data = pd.concat([existing_data, data]).drop_duplicates(['id'], keep='last')
                     updated_data.to_csv(save_path, index=False, encoding="utf-8-sig")
                 except Exception as e:
                     # 깨진 파일인 경우 overwrite
                     data.to_csv(save_path, index=False, encoding="utf-8-sig")
 
+    def _on_saved(self, store_name):
+        """
+        브랜드 결과가 실제로 기록된 뒤 호출 -> 저널 정리
+        """
+        if self.journal is not None:
+            self.journal.complete(store_name)
+        if self._lease is not None:
+            queue, worker_id = self._lease
+            queue.complete(worker_id, store_name)
+
+    def _on_brand_saved(self, store_name):
+        """
+        브랜드 완료 처리가 기록된 뒤 호출 (sqlite 는 writer 스레드, 앞선 batch 의 매장 인덱스 갱신이 모두 끝난 뒤)
+        """
+        self._on_saved(store_name)
+        if self.place_index is not None:
+            self.place_index.finish_brand(store_name)
+
     def _load_progress(self):
         """
         저장된 진행 상황 로드 -> 이미 처리 완료된 store_name들의 리스트를 반환
         """
+        if self.store is not None:
+            return self.store.done_brands()
         save_path_list = glob(f"{self.progress_file_path}/*.csv")
         progressed = [os.path.basename(i).rstrip('.csv') for i in save_path_list]
         return progressed
 
-    def rotate_api_key(self, old_index):
+    def get_places(self, keyword, page=1, rect=None):
         """
-        API Key를 순환하며 소진 시 다음 키로 변경.
-        여러 스레드에서 동시에 접근할 수 있으므로 Lock
+        Kakao 로컬 검색 API를 호출하여 데이터를 가져옴.
+        rect: "min_x,min_y,max_x,max_y" 지정 시 해당 사각형 영역 안에서만 검색
+        캐시가 켜져 있으면 유효한 캐시 응답을 먼저 사용.
         """
-        with self.api_key_lock:
-            if self.api_index >= len(self.api_keys):
-                # 987 예외를 발생시켜서 상위에서 중단하도록 유도
-                raise Exception(987, "모든 API 키 소진")
-            if old_index == self.api_index:
-                # 멀티스레드 대비 실제 rotate 해야되는 api 키와 현재 인덱스가 같은 경우
-                self.api_index += 1
-                print(f"[API KEY ROTATE] {self.api_keys[self.api_index - 1]} -> {self.api_keys[self.api_index]}")
-                self.headers = {"Authorization": f"KakaoAK {self.api_keys[self.api_index]}"}
+        return self._get_places(keyword, page, rect)[0]
 
-    def get_places(self, keyword, page=1):
+    def _get_places(self, keyword, page=1, rect=None):
         """
-        Kakao 로컬 검색 API를 호출하여 데이터를 가져옴.
+        get_places + 응답 출처 -> (응답, 'cache' | 'api')
+        """
+        if self.cache is not None:
+            cached = self.cache.get(self._cache_query(keyword, rect), page)
+            if cached is not None:
+                return json.loads(cached), 'cache'
+        return self._request_places(keyword, page, rect), 'api'
+
+    @property
+    def counts(self):
+        """
+        이번 실행의 실제 API 호출 수
+        """
+        return self.metrics.api_calls
+
+    def _strategy(self, store_name, keyword, rect):
+        """
+        요청 분류 (지표용): quadtree / flat(브랜드명만) / sido / gu / dong
         """
-        url = "https://dapi.kakao.com/v2/local/search/keyword.json"
+        if rect is not None:
+            return 'quadtree'
+        region = keyword[len(store_name):].strip()
+        if not region:
+            return 'flat'
+        if region in self._sido_queries:
+            return 'sido'
+        return 'gu' if region in self._gu_queries else 'dong'
+
+    @staticmethod
+    def _cache_query(keyword, rect):
+        return keyword if rect is None else f"{keyword}|rect={rect}"
+
+    @staticmethod
+    def _params(keyword, page, rect):
         params = {"query": keyword, "page": page}
+        if rect is not None:
+            params["rect"] = rect
+        return params
+
+    def _request_places(self, keyword, page=1, rect=None):
+        """
+        실제 API 호출.
+        - 429 응답 시 해당 키를 소진 처리하고 다른 키로 재시도
+        - 5xx / 네트워크 오류(timeout 포함)는 backoff 후 재시도 (RetryPolicy)
+        - 그 외 응답은 예외
+        """
+        params = self._params(keyword, page, rect)
+        attempt = 0
         try:
-            old_index = self.api_index
-            response = requests.get(url, params=params, headers=self.headers)
-            self.counts += 1
-            if response.status_code == 200:
-                return response.json()
-            elif response.status_code == 429 or response.text == '{"errorType":"RequestThrottled","message":"API limit has been exceeded."}':
-                # API Limit 초과로 인해 인증 실패 시 -> 키 변경
-                self.rotate_api_key(old_index)
-                return self.get_places(keyword, page)
-            else:
-                print(f"[Error {response.status_code}]: {response.text}")
-                raise
+            while True:
+                try:
+                    api_key, status, text = self._send_hedged(params)
+                except NETWORK_ERRORS as e:
+                    attempt = self._retry_wait(attempt, e)
+                    continue
+                if status == 200:
+                    if self.cache is not None:
+                        self.cache.put(self._cache_query(keyword, rect), page, text)
+                    return json.loads(text)
+                elif status == 429 or text == THROTTLED_BODY:
+                    # API Limit 초과로 인해 인증 실패 시 -> 키 변경
+                    self.key_pool.mark_throttled(api_key)
+                elif status >= 500:
+                    attempt = self._retry_wait(attempt, Exception(status, text))
+                else:
+                    print(f"[Error {status}]: {text}")
+                    raise Exception(status, text)
         except Exception as e:
             # 여기서 987 예외는 그대로 재발생시켜 상위로 전달
             if len(e.args) > 0 and e.args[0] == 987:
@@ -144,6 +303,92 @@ class KakaoAPIManager:
             print(f"[API 요청 실패] {e}")
             raise
 
+    def _retry_wait(self, attempt, error):
+        """
+        재시도 가능하면 backoff 만큼 대기 후 다음 attempt 반환, 아니면 error 를 그대로 raise
+        """
+        delay = self.retry.next_delay(attempt)
+        if delay is None:
+            raise error
+        self.metrics.incr('retry')
+        time.sleep(delay)
+        return attempt + 1
+
+    def _send(self, params):
+        """
+        키 하나로 요청 한 번 -> (api_key, status, text)
+        """
+        # hedging 기준은 키 대기를 포함한 전체 시간, 지표의 지연은 네트워크 요청 시간
+        submitted = time.perf_counter()
+        api_key = self.key_pool.acquire()
+        headers = {"Authorization": f"KakaoAK {api_key}"}
+        started = time.perf_counter()
+        try:
+            response = self._session().get(self.api_url, params=params, headers=headers, timeout=self.retry.timeout)
+        except Exception:
+            self.metrics.request(api_key, 'error', time.perf_counter() - started)
+            raise
+        self.metrics.request(api_key, response.status_code, time.perf_counter() - started)
+        if response.status_code == 200:
+            self.retry.observe(time.perf_counter() - submitted)
+        return api_key, response.status_code, response.text
+
+    def _send_hedged(self, params):
+        """
+        _send + hedging: 응답이 hedge_delay 안에 오지 않으면 같은 요청을 한 번 더 보내고 먼저 끝난 응답 사용.
+        늦게 끝난 요청은 버린다 (requests 는 진행 중인 요청을 취소할 수 없음).
+        """
+        hedge_delay = self.retry.hedge_delay()
+        if hedge_delay is None:
+            return self._send(params)
+
+        primary = self._hedge_executor().submit(self._send, params)
+        try:
+            return primary.result(timeout=hedge_delay)
+        except concurrent.futures.TimeoutError:
+            pass
+        self.metrics.incr('hedged')
+        hedge = self._hedge_executor().submit(self._send, params)
+        pending = {primary, hedge}
+        error = None
+        while pending:
+            done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    if future is hedge:
+                        self.metrics.incr('hedge_won')
+                    return future.result()
+                error = future.exception()
+        raise error
+
+    def _hedge_executor(self):
+        with self._hedge_lock:
+            if self._hedge_pool is None:
+                self._hedge_pool = concurrent.futures.ThreadPoolExecutor(max_workers=64, thread_name_prefix='hedge')
+            return self._hedge_pool
+
+    def _fetch(self, store_name, keyword, page=1, rect=None):
+        """
+        브랜드 수집 중 요청 한 건. 저널에 완료 기록이 있으면 재사용, 없으면 API 호출 후 기록.
+        """
+        strategy = self._strategy(store_name, keyword, rect)
+        if self.journal is not None:
+            result = self.journal.lookup(store_name, keyword, page, rect)
+            if result is not None:
+                self.metrics.brand_request(store_name, strategy, 'journal')
+                return result
+        result, source = self._get_places(keyword, page, rect)
+        self.metrics.brand_request(store_name, strategy, source)
+        if self.journal is not None and result is not None:
+            self.journal.record(store_name, keyword, page, result, rect)
+        return result
+
+    def _session(self):
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self._local.session = requests.Session()
+        return session
+
     def check_stop(self, result, gu_name=None):
         """
         수집 중단 조건 확인.
@@ -165,18 +410,9 @@ class KakaoAPIManager:
         영업표지 기준으로 데이터를 수집하고 진행 상황을 저장/이어가기.
         최대 10개씩(기본값) 스레드로 동시에 처리하며, 진행 바를 표시.
         """
-        completed_stores = set(self.saved_progress)
+        tasks = self._pending_tasks()
         total_target_count = len(self.target_df)
 
-        tasks = []
-        for target_index, row in self.target_df.iterrows():
-            raw_name = row["영업표지"]
-            store_name = self._name_change(raw_name)
-            if store_name not in completed_stores:
-                tasks.append((target_index, store_name))
-
-        print(f"[INFO] 총 수집 대상: {len(tasks)} / 전체 {total_target_count}")
-
         with tqdm(total=len(tasks), desc="전체 진행 상황") as pbar:
             # ThreadPoolExecutor 실행
             with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
@@ -209,6 +445,399 @@ class KakaoAPIManager:
                     print(f"[ERROR] 메인 루프에서 처리되지 않은 에러: {e}")
 
         print("[INFO] 모든 스레드 작업 완료.")
+        self._report_run()
+
+    def collect_stores_queued(self, max_workers=10, max_brands=None, tasks=None):
+        """
+        [전역 작업 큐 버전]
+        브랜드 단위가 아닌 (브랜드, 지역, 페이지) 요청 단위로 작업을 나눠 모든 워커가 나눠서 처리.
+        대형 브랜드의 구/동 검색이 워커 하나에 몰려 마지막에 혼자 오래 도는 문제를 없앤다.
+        브랜드별 결과는 해당 브랜드의 지역 요청이 모두 끝난 뒤 한 번에 저장.
+        tasks: [(target_index, store_name), ...] 지정 시 이 브랜드만 수집 (run_forever)
+        """
+        tasks = self._pending_tasks() if tasks is None else tasks
+        scheduler = RegionTaskScheduler(self, max_workers=max_workers, max_brands=max_brands)
+        scheduler.run(tasks, len(self.target_df))
+        print("[INFO] 모든 작업 큐 처리 완료.")
+        self._report_run()
+
+    def run_forever(self, tiers=None, upjong_weights=None, max_workers=10, batch_size=200, quota_reserve=0.2,
+                    prefetch_score=0.5, idle_seconds=600, failure_backoff=3600):
+        """
+        [상시 실행 버전]
+        전체 수집 후 23시간 대기하는 대신 브랜드별 우선순위(collect.priority.BrandPriority)에 따라
+        목표 갱신 주기(tiers)가 지난 브랜드부터 batch_size 개씩 계속 수집. 배치마다 우선순위를 다시 계산.
+        - 갱신 대상이 없어도 남은 할당량이 전체 일일 할당량의 quota_reserve 비율보다 많으면
+          목표 주기의 prefetch_score 배 이상 지난 브랜드를 앞당겨 수집 (남는 할당량을 버리지 않음)
+        - 수집할 브랜드가 없으면 다음 브랜드의 갱신 시각까지(최대 idle_seconds) 대기
+        - 모든 키 소진 시 할당량 초기화 시각까지 대기
+        - 수집했는데 저장되지 않은 브랜드(빈 검색어 400 등)는 failure_backoff 초부터 실패할 때마다 2배(최대 1일)씩
+          재시도를 미룸, 배치에서 저장된 브랜드가 하나도 없으면 idle_seconds 대기
+        """
+        priority = BrandPriority(self.target_df, tiers=tiers, upjong_weights=upjong_weights)
+        total_quota = self.key_pool.daily_quota * len(self.api_keys)
+        # 브랜드별 (연속 실패 횟수, 다음 시도 가능 시각)
+        failures = {}
+        while True:
+            ranked = priority.rank(*self._crawl_state(priority.change_days))
+            now = time.time()
+            cooling = [brand for brand, (_, retry_at) in failures.items() if retry_at > now]
+            ranked = ranked.drop(cooling, errors='ignore')
+            remaining = self.key_pool.stats()['remaining_quota']
+            if remaining == 0:
+                wait = self.key_pool.seconds_until_reset() + 1
+                print(f"[SCHEDULE] 모든 API 키 소진 -> 할당량 초기화까지 {wait / 3600:.1f}시간 대기")
+                time.sleep(wait)
+                continue
+
+            due = ranked[ranked['due_in'] <= 0]
+            label = '갱신'
+            if len(due) == 0 and remaining > total_quota * quota_reserve:
+                due = ranked[ranked['score'] >= prefetch_score]
+                label = '앞당김'
+            if len(due) == 0:
+                next_due = [float(ranked['due_in'].min())] if len(ranked) else []
+                next_due += [failures[brand][1] - now for brand in cooling]
+                wait = min(max(min(next_due, default=idle_seconds), 1), idle_seconds)
+                print(f"[SCHEDULE] 갱신 대상 없음 -> {wait:.0f}초 대기 (남은 할당량 {remaining}건)")
+                time.sleep(wait)
+                continue
+
+            batch = due.head(batch_size)
+            tiers_count = batch['tier'].value_counts().to_dict()
+            print(f"[SCHEDULE] {label} 대상 {len(due)}개 중 {len(batch)}개 수집 {tiers_count}, 남은 할당량 {remaining}건")
+            if self.place_index is not None:
+                self.place_index.begin_run()
+            # 재시도 예산은 배치마다 새로 (프로세스 전체 누적으로 소진되지 않도록)
+            self.retry.reset_budget()
+            started = time.time()
+            self.collect_stores_queued(max_workers=max_workers, tasks=list(zip(batch['target_index'], batch.index)))
+
+            last_crawled = self._crawl_state(priority.change_days)[0]
+            saved = [brand for brand in batch.index if last_crawled.get(brand, 0) >= started]
+            for brand in saved:
+                failures.pop(brand, None)
+            if self.key_pool.stats()['remaining_quota'] == 0:
+                # 키 소진으로 중단된 브랜드는 실패로 보지 않음 (초기화 후 다시 수집)
+                continue
+            for brand in batch.index.difference(saved):
+                count = failures.get(brand, (0, 0))[0] + 1
+                failures[brand] = (count, time.time() + min(failure_backoff * 2 ** (count - 1), DAY))
+            if not saved:
+                print(f"[SCHEDULE] 배치에서 저장된 브랜드 없음 -> {idle_seconds}초 대기 (실패 브랜드 {len(failures)}개 재시도 보류)")
+                time.sleep(idle_seconds)
+
+    def _crawl_state(self, change_days):
+        """
+        우선순위 계산용 (브랜드별 마지막 수집 시각, 마지막 수집 행 수, 최근 change_days 동안 변화 수)
+        """
+        if self.store is not None:
+            done = self.store.done_times()
+            last_crawled = {brand: updated_at for brand, (updated_at, _) in done.items()}
+            last_rows = {brand: rows for brand, (_, rows) in done.items()}
+        else:
+            # csv 저장은 파일 수정 시각 기준 (행 수는 알 수 없음)
+            last_crawled = {os.path.splitext(os.path.basename(path))[0]: os.path.getmtime(path)
+                            for path in glob(f"{self.progress_file_path}/*.csv")}
+            last_rows = {}
+        changes = {}
+        if self.place_index is not None:
+            changes = self.place_index.change_counts(time.time() - change_days * DAY)
+        return last_crawled, last_rows, changes
+
+    def collect_stores_leased(self, queue_path='./cache/work_queue.sqlite', worker_id=None, max_workers=10,
+                              lease_seconds=300, poll_seconds=10):
+        """
+        [여러 프로세스 / 서버 분산 버전]
+        공유 작업 큐(BrandWorkQueue)에서 브랜드를 lease 로 가져와 수집. 같은 큐 파일을 쓰는 워커끼리
+        브랜드를 나눠 가지며, 죽은 워커의 브랜드는 lease 만료 후 다른 워커가 이어서 수집한다.
+        워커마다 key_shard 로 서로 다른 API 키를 쓰는 것을 전제로 함.
+        """
+        queue = BrandWorkQueue(queue_path, lease_seconds=lease_seconds)
+        worker_id = worker_id or queue.default_worker_id()
+        queue.fill(self._pending_tasks())
+        total_target_count = len(self.target_df)
+
+        in_flight = {}
+        # in_flight 변경 / heartbeat 스레드의 읽기를 같은 lock 으로 (순회 중 dict 크기 변경 방지)
+        in_flight_lock = threading.Lock()
+        stop_event = threading.Event()
+
+        def heartbeat():
+            # lease 만료 전에 주기적으로 연장 (수집이 오래 걸리는 대형 브랜드)
+            while not stop_event.wait(lease_seconds / 3):
+                with in_flight_lock:
+                    leased = list(in_flight.values())
+                try:
+                    queue.renew(worker_id, leased)
+                except Exception as e:
+                    print(f"[LEASE] {worker_id} 연장 실패: {e}")
+
+        # 완료 처리는 결과가 실제로 기록된 뒤(_on_saved) -> 저장 전에 죽으면 lease 만료 후 다른 워커가 다시 수집
+        self._lease = (queue, worker_id)
+        self.metrics.set_gauge('leased_brands', lambda: len(in_flight))
+        renewer = threading.Thread(target=heartbeat, daemon=True)
+        renewer.start()
+        exhausted = False
+        try:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+                while True:
+                    if not exhausted and len(in_flight) < max_workers:
+                        for idx, store_name in queue.lease(worker_id, max_workers - len(in_flight)):
+                            future = executor.submit(self._collect_and_save_store, store_name, idx, total_target_count)
+                            with in_flight_lock:
+                                in_flight[future] = store_name
+                    if not in_flight:
+                        if exhausted or not queue.stats().get('leased'):
+                            break
+                        # 다른 워커가 잡고 있는 브랜드만 남음 -> 끝나거나 lease 가 만료될 때까지 대기
+                        time.sleep(poll_seconds)
+                        continue
+
+                    done, _ = concurrent.futures.wait(
+                        in_flight, timeout=poll_seconds, return_when=concurrent.futures.FIRST_COMPLETED
+                    )
+                    for future in done:
+                        with in_flight_lock:
+                            store_name = in_flight.pop(future)
+                        try:
+                            future.result()
+                        except Exception as exc:
+                            # 모든 API키 소진 에러(987): 새 lease 를 받지 않고 진행 중인 브랜드만 마무리
+                            if len(exc.args) > 0 and exc.args[0] == 987:
+                                if not exhausted:
+                                    print(f"[ERROR] {worker_id} 모든 API 키 소진: 남은 브랜드를 큐에 반납합니다.")
+                                exhausted = True
+                                queue.release(worker_id, store_name)
+                            else:
+                                print(f"[ERROR] {store_name} 수집 실패: {exc}")
+                                queue.fail(worker_id, store_name, exc)
+            if self.store is not None:
+                # writer 스레드에 남은 저장 -> 완료 처리까지 마친 뒤 반납
+                self.store.flush()
+        finally:
+            stop_event.set()
+            self._lease = None
+            self.metrics.set_gauge('leased_brands', None)
+            queue.release(worker_id)
+
+        print(f"[INFO] {worker_id} 작업 큐 처리 완료. {queue.stats()}")
+        self._report_run()
+
+    def _report_run(self):
+        if self.store is not None:
+            self.store.flush()
+        self.key_pool.flush()
+        key_stats = self.key_pool.stats()
+        print(f"[KEY POOL] 오늘({key_stats['day']}) 사용 {sum(key_stats['usage'].values())}건, "
+              f"소진 키 {key_stats['exhausted']}/{len(self.api_keys)}, 남은 할당량 {key_stats['remaining_quota']}건")
+        if self.place_index is not None:
+            diff_path = self.place_index.write_diff(os.path.join(self.progress_file_path, 'diff'))
+            if diff_path:
+                print(f"[PLACE DIFF] {diff_path} 저장")
+        if self.cache is not None:
+            stats = self.cache.stats()
+            print(f"[CACHE] hit {stats['hits']} / miss {stats['misses']} (hit rate {stats['hit_rate']:.1%}), "
+                  f"evicted {stats['evicted']}, {stats['bytes'] / 1024 / 1024:.1f}MB")
+        snapshot = self.metrics.snapshot()
+        latency = snapshot['latency']
+        mean_ms = latency['sum'] / latency['count'] * 1000 if latency['count'] else 0.0
+        by_strategy = {}
+        for key, count in snapshot['strategy_calls'].items():
+            strategy, source = key.split('.')
+            if source == 'api':
+                by_strategy[strategy] = by_strategy.get(strategy, 0) + count
+        print(f"[METRICS] API {snapshot['api_calls']}건 (429 {snapshot['throttled_rate']:.1%}), 평균 지연 {mean_ms:.1f}ms, "
+              f"전략별 API 호출 {by_strategy}, 재시도 {snapshot['events'].get('retry', 0)}건, "
+              f"hedge {snapshot['events'].get('hedged', 0)}건")
+        self.metrics.flush()
+
+    def _pending_tasks(self):
+        """
+        아직 수집 안 된 (target_index, store_name) 목록 (recrawl=True 면 전체)
+        """
+        completed_stores = set() if self.recrawl else set(self.saved_progress)
+        total_target_count = len(self.target_df)
+        if self.place_index is not None:
+            # 실행 시작 -> 이번 실행에서 보이지 않은 매장이 폐점 후보
+            self.place_index.begin_run()
+
+        # 같은 검색어로 변환되는 영업표지는 한 번만 수집
+        query_table = build_query_table(self.target_df)
+        pending = query_table[~query_table.index.isin(completed_stores)]
+        tasks = list(zip(pending['target_index'], pending.index))
+
+        merged = int((pending['n_rows'] - 1).sum())
+        print(f"[INFO] 총 수집 대상: {len(tasks)} / 전체 {total_target_count} (중복 검색어 {merged}건 통합)")
+        return tasks
+
+    def collect_stores_async(self, max_in_flight=200, max_brands=50):
+        """
+        [asyncio 버전]
+        collect_stores_in_parallel 과 같은 결과를 만들지만, 스레드 대신 하나의 이벤트 루프에서
+        keep-alive 연결 풀(aiohttp)로 최대 max_in_flight 개의 요청을 동시에 보낸다.
+        max_brands: 동시에 진행하는 브랜드 수 (브랜드 내부의 구/동 검색도 동시에 진행됨)
+        """
+        tasks = self._pending_tasks()
+        asyncio.run(self._collect_all_async(tasks, len(self.target_df), max_in_flight, max_brands))
+        print("[INFO] 모든 비동기 작업 완료.")
+        self._report_run()
+
+    async def _collect_all_async(self, tasks, total_target_count, max_in_flight, max_brands):
+        # 실행마다 새 semaphore (같은 manager 로 여러 번 / 동시에 실행해도 서로 영향 없음)
+        semaphore = asyncio.Semaphore(max_in_flight)
+        pending = list(reversed(tasks))
+        connector = aiohttp.TCPConnector(limit=max_in_flight, ttl_dns_cache=300)
+
+        self.metrics.set_gauge('pending_brands', lambda: len(pending))
+        timeout = aiohttp.ClientTimeout(total=None, sock_connect=self.retry.connect_timeout,
+                                        sock_read=self.retry.read_timeout)
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+            with tqdm(total=len(tasks), desc="전체 진행 상황") as pbar:
+                async def worker():
+                    while pending:
+                        idx, store_name = pending.pop()
+                        try:
+                            await self._collect_and_save_store_async(session, semaphore, store_name, idx, total_target_count)
+                        except Exception as exc:
+                            if len(exc.args) > 0 and exc.args[0] == 987:
+                                if pending:
+                                    print("[ERROR] 모든 API 키 소진: 나머지 작업을 중단합니다.")
+                                    pending.clear()
+                            else:
+                                print(f"[ERROR] {store_name} (index:{idx}) 수집 실패: {exc}")
+                        finally:
+                            pbar.update(1)
+
+                await asyncio.gather(*[worker() for _ in range(min(max_brands, len(tasks)))])
+        self.metrics.set_gauge('pending_brands', None)
+
+    async def _collect_and_save_store_async(self, session, semaphore, store_name, target_index, total_target_count):
+        """
+        _collect_and_save_store 의 비동기 버전. 저장은 별도 스레드에서 수행해 이벤트 루프를 막지 않음.
+        """
+        print(f"[START] {store_name} (index:{target_index}/{total_target_count}) 수집 시작")
+        stream = self._open_stream(store_name)
+        await self._run_plan_async(session, semaphore, store_name, self._search_plan(store_name, stream.add))
+        return await asyncio.to_thread(self._close_stream, stream)
+
+    async def _run_plan_async(self, session, semaphore, store_name, plan):
+        """
+        검색 계획(_search_plan)의 각 단계 요청들을 동시에 실행
+        """
+        try:
+            batch = next(plan)
+            while True:
+                responses = await asyncio.gather(*[self._fetch_async(session, semaphore, store_name, *request) for request in batch])
+                batch = plan.send(list(responses))
+        except StopIteration as e:
+            return e.value
+
+    async def _fetch_async(self, session, semaphore, store_name, keyword, page=1, rect=None):
+        """
+        _fetch 의 비동기 버전
+        """
+        strategy = self._strategy(store_name, keyword, rect)
+        if self.journal is not None:
+            result = self.journal.lookup(store_name, keyword, page, rect)
+            if result is not None:
+                self.metrics.brand_request(store_name, strategy, 'journal')
+                return result
+        result, source = await self._get_places_async(session, semaphore, keyword, page, rect)
+        self.metrics.brand_request(store_name, strategy, source)
+        if self.journal is not None and result is not None:
+            self.journal.record(store_name, keyword, page, result, rect)
+        return result
+
+    async def _get_places_async(self, session, semaphore, keyword, page=1, rect=None):
+        """
+        _get_places 의 비동기 버전 -> (응답, 'cache' | 'api'). 429 / 5xx / 네트워크 오류 처리는 _request_places 와 동일.
+        """
+        if self.cache is not None:
+            cached = self.cache.get(self._cache_query(keyword, rect), page)
+            if cached is not None:
+                return json.loads(cached), 'cache'
+
+        params = self._params(keyword, page, rect)
+        attempt = 0
+        while True:
+            try:
+                api_key, status, text = await self._send_hedged_async(session, semaphore, params)
+            except ASYNC_NETWORK_ERRORS as e:
+                attempt = await self._retry_wait_async(attempt, e)
+                continue
+            if status == 200:
+                if self.cache is not None:
+                    self.cache.put(self._cache_query(keyword, rect), page, text)
+                return json.loads(text), 'api'
+            elif status == 429 or text == THROTTLED_BODY:
+                self.key_pool.mark_throttled(api_key)
+            elif status >= 500:
+                attempt = await self._retry_wait_async(attempt, Exception(status, text))
+            else:
+                print(f"[Error {status}]: {text}")
+                raise Exception(status, text)
+
+    async def _retry_wait_async(self, attempt, error):
+        delay = self.retry.next_delay(attempt)
+        if delay is None:
+            raise error
+        self.metrics.incr('retry')
+        await asyncio.sleep(delay)
+        return attempt + 1
+
+    async def _send_async(self, session, semaphore, params):
+        submitted = time.perf_counter()
+        async with semaphore:
+            # 키(초당 요청 수 / 일일 사용량)는 실제로 보내기 직전에 할당 -> semaphore 대기 후 한꺼번에 나가지 않음
+            api_key = await self.key_pool.acquire_async()
+            headers = {"Authorization": f"KakaoAK {api_key}"}
+            started = time.perf_counter()
+            try:
+                async with session.get(self.api_url, params=params, headers=headers) as response:
+                    status = response.status
+                    text = await response.text()
+            except asyncio.CancelledError:
+                # hedging 에서 늦어서 취소된 요청
+                self.metrics.request(api_key, 'cancelled', time.perf_counter() - started)
+                raise
+            except Exception:
+                self.metrics.request(api_key, 'error', time.perf_counter() - started)
+                raise
+            self.metrics.request(api_key, status, time.perf_counter() - started)
+        if status == 200:
+            self.retry.observe(time.perf_counter() - submitted)
+        return api_key, status, text
+
+    async def _send_hedged_async(self, session, semaphore, params):
+        """
+        _send_hedged 의 비동기 버전. 먼저 끝난 응답을 사용하고 남은 요청은 취소.
+        """
+        hedge_delay = self.retry.hedge_delay()
+        if hedge_delay is None:
+            return await self._send_async(session, semaphore, params)
+
+        primary = asyncio.ensure_future(self._send_async(session, semaphore, params))
+        done, _ = await asyncio.wait({primary}, timeout=hedge_delay)
+        if done:
+            return primary.result()
+        self.metrics.incr('hedged')
+        hedge = asyncio.ensure_future(self._send_async(session, semaphore, params))
+        pending = {primary, hedge}
+        error = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self.metrics.incr('hedge_won')
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
 
     def _collect_and_save_store(self, store_name, target_index, total_target_count):
         """
@@ -216,14 +845,9 @@ class KakaoAPIManager:
         """
         try:
             print(f"[START] {store_name} (index:{target_index}/{total_target_count}) 수집 시작")
-            result_df = self.collect_stores(store_name)
-            rd_len = len(result_df)
-            result_df.drop_duplicates(['id'], inplace=True)
-            print(f"[DE-DUP] {store_name} 중복 제거 {rd_len} -> {len(result_df)}")
-
-            self._save_progress(result_df, store_name)
-            print(f"[SAVED] {store_name} - 데이터 저장 완료")
-            return result_df
+            stream = self._open_stream(store_name)
+            self._run_plan(store_name, self._search_plan(store_name, stream.add))
+            return self._close_stream(stream)
 
         except Exception as e:
             # 987 예외(모든 api key 소진)는 그대로 raise
@@ -232,59 +856,340 @@ class KakaoAPIManager:
             # 그 외 에러는 여기서 처리 가능 (로그 남기기 등)
             raise
 
+    def _open_stream(self, store_name):
+        """
+        브랜드 결과 파이프라인 생성.
+        sqlite 저장소는 batch 단위로 바로 upsert, csv 는 중복 제거된 행만 모아 두었다가 마지막에 한 번 저장.
+        """
+        self.metrics.brand_start(store_name)
+        if self.store is None:
+            return DocumentStream(store_name, row_filter=self.relevance)
+
+        def on_batch(df):
+            # 매장 인덱스 갱신도 writer 스레드에서 (수집 스레드 / 이벤트 루프가 디스크를 기다리지 않음)
+            on_saved = None
+            if self.place_index is not None:
+                on_saved = lambda brand: self.place_index.observe(brand, df)
+            self.store.upsert(store_name, df, on_saved=on_saved)
+        return DocumentStream(store_name, on_batch=on_batch, row_filter=self.relevance)
+
+    def _close_stream(self, stream):
+        """
+        브랜드 수집 종료 -> 남은 결과 저장 + 완료 처리
+        """
+        store_name = stream.store_name
+        print(f"[DE-DUP] {store_name} 중복 제거 {stream.total} -> {stream.unique}")
+        if self.store is not None:
+            stream.flush()
+        else:
+            result_df = stream.to_frame()
+        if stream.flagged:
+            action = '제외' if self.relevance.mode == 'drop' else '검토 대상'
+            print(f"[RELEVANCE] {store_name} 브랜드 불일치 {stream.flagged}건 {action}")
+        if self.store is not None:
+            self.store.mark_done(store_name, stream.kept, on_saved=self._on_brand_saved)
+        else:
+            self._save_progress(result_df, store_name)
+            if self.place_index is not None:
+                self.place_index.observe(store_name, result_df)
+            self._on_brand_saved(store_name)
+        self.metrics.brand_finish(store_name, stream.kept)
+        print(f"[SAVED] {store_name} - 데이터 저장 완료")
+        return stream.kept
+
     def collect_stores(self, store_name):
         """
         특정 가게 이름을 기준으로 데이터를 수집.
         """
-        first_result = self.get_places(store_name, page=1)
+        stream = DocumentStream(store_name, row_filter=self.relevance)
+        self._run_plan(store_name, self._search_plan(store_name, stream.add))
+        return stream.to_frame()
+
+    def _run_plan(self, store_name, plan):
+        """
+        검색 계획(_search_plan)을 현재 스레드에서 순차 실행
+        """
+        try:
+            batch = next(plan)
+            while True:
+                batch = plan.send([self._fetch(store_name, *request) for request in batch])
+        except StopIteration as e:
+            return e.value
+
+    def _search_plan(self, store_name, emit):
+        """
+        검색 계획 generator.
+        다음에 호출할 (검색어, page[, rect]) 목록을 yield 하고, 같은 순서의 응답 목록을 send 로 받는다.
+        수집 대상 응답은 받는 즉시 emit(응답) 으로 넘김 -> 동기(_run_plan) / 비동기(_run_plan_async) /
+        작업 큐(RegionTaskScheduler) 실행기가 같은 계획을 공유.
+        """
+        [first_result] = yield [(store_name, 1)]
         if not first_result or 'meta' not in first_result:
             print(f"[{store_name}] 첫 검색 결과가 없거나 오류.")
-            return pd.DataFrame()
+            return
 
         total_count = first_result['meta']['total_count']
         print(f"[{store_name}] total_count = {total_count}")
-        all_collected = []
+
+        if self.region_history is not None and (total_count <= 45 or self.search_mode == 'quadtree'):
+            # 구/동 검색을 하지 않는 브랜드도 전국 total_count 는 기록 (수집 계획 추정용, collect.planner)
+            self.region_history.update(store_name, {store_name: total_count})
 
         if total_count <= 15:
-            all_collected.append(first_result)
+            emit(first_result)
         elif total_count <= 45:
             print(f" => 45건 이하, 단순 전체 검색 (1~3페이지)")
-            results = self.collect_data_by_region(store_name, '', start_page=2, max_pages=3)
-            results = [first_result] + results
-            all_collected.extend(results)
+            emit(first_result)
+            yield from self._page_plan([(f"{store_name} ", None, 2)], emit)
+        elif self.search_mode == 'quadtree':
+            print(f" => 45건 초과, 영역(rect) 분할 검색")
+            yield from self._quadtree_plan(store_name, emit)
         else:
-            print(f" => 45건 초과, 구, 동 단위 검색")
-            for gu, value in self.guso_index.items():
-                gu_keyword = value['gu']
-                only_gu = value['only_gu']
-                first_result = self.get_places(store_name + ' ' + gu_keyword, page=1)
-
-                if first_result['meta']['total_count'] <= 45:
-                    gu_results = self.collect_data_by_region(store_name, gu_keyword, gu_name=only_gu, start_page=2, max_pages=3)
-                    all_collected.extend([first_result] + gu_results)
-                else:
-                    for dong_keyword in value['dong']:
-                        dong_results = self.collect_data_by_region(store_name, dong_keyword, gu_name=only_gu, max_pages=3)
-                        if dong_results:
-                            all_collected.extend(dong_results)
+            print(f" => 45건 초과, {'시도, ' if self.sido_tier else ''}구, 동 단위 검색")
+            yield from self._region_plan(store_name, total_count, emit)
+
+    def _region_plan(self, store_name, total_count, emit):
+        """
+        45건 초과 브랜드의 시도 / 구 / 동 검색 계획.
+        지역은 예상 밀도(지난 수집 total_count, 기록이 없으면 동 개수) 순으로 검색하고, coverage_tolerance 지정 시
+        지금까지 받은 브랜드 매장(_brand_ids) 고유 id 수가 전국 total_count x (1 - coverage_tolerance) 에 도달하면
+        남은 지역은 검색하지 않음 (검색어가 섞여 나오는 다른 가게는 세지 않음).
+        """
+        previous = self._previous_counts(store_name, total_count)
+        observed = {store_name: total_count}
+        seen = set()
+        target = None if self.coverage_tolerance is None else total_count * (1 - self.coverage_tolerance)
+        chunk_size = self.sweep_chunk_size if target is not None else None
+        stopped = []
+
+        def emit_seen(result):
+            if target is not None:
+                seen.update(self._brand_ids(store_name, result['documents']))
+            emit(result)
+
+        def covered():
+            # 남은 요청이 있을 때만 호출됨 -> True 면 실제로 검색을 생략
+            if target is not None and len(seen) >= target:
+                stopped.append(True)
+                return True
+            return False
+
+        regions = []
+        if self.sido_tier:
+            # 시도 검색 후 45건 초과인 시도의 구만 구/동 검색
+            gu_values = yield from self._sido_plan(store_name, previous, observed, regions, emit_seen, covered, chunk_size)
+        else:
+            gu_values = list(self.guso_index.values())
+        gu_values = self._by_density(previous, gu_values, lambda value: f"{store_name} {value['gu']}",
+                                     lambda value: len(value['dong']))
+
+        def add_dongs(value):
+            dong_queries = [f"{store_name} {dong_keyword}" for dong_keyword in value['dong']]
+            dong_queries = [query for query in dong_queries if self._should_probe(previous, query)]
+            regions.extend((query, value['only_gu'], 1)
+                           for query in self._by_density(previous, dong_queries, lambda query: query, lambda query: 0))
+
+        # 지난 수집에서 45건 초과였던 구는 바로 동 검색, 0건이었던 구는 재확인 주기가 지난 경우만 검색
+        probe = []
+        for value in gu_values:
+            gu_query = f"{store_name} {value['gu']}"
+            if self._should_probe(previous, gu_query) and previous.get(gu_query, (0,))[0] <= 45:
+                probe.append(value)
+            elif previous[gu_query][0] > 45:
+                add_dongs(value)
+
+        # 구 단위로 검색 후 45건 초과인 경우 동 단위 검색
+        def on_gu(k, gu_first):
+            value = probe[k]
+            gu_query = f"{store_name} {value['gu']}"
+            if not gu_first or 'meta' not in gu_first:
+                return
+            observed[gu_query] = gu_first['meta']['total_count']
+            if gu_first['meta']['total_count'] <= 45:
+                emit_seen(gu_first)
+                regions.append((gu_query, value['only_gu'], 2))
+            else:
+                add_dongs(value)
+
+        yield from self._probe_plan([(f"{store_name} {value['gu']}", 1) for value in probe], on_gu, covered, chunk_size)
+
+        # 이미 결과가 있는 시도/구의 다음 페이지 먼저, 그 다음 동 검색
+        regions.sort(key=lambda region: region[2] == 1)
+        first_counts = yield from self._page_plan(regions, emit_seen, stop=covered, chunk_size=chunk_size)
+        for (query, _, start_page), count in zip(regions, first_counts):
+            if start_page == 1 and count is not None:
+                observed[query] = count
+
+        if stopped:
+            print(f"[COVERAGE] {store_name} 브랜드 매장 {len(seen)} / total_count {total_count} 도달, 남은 지역 검색 생략")
+            self.metrics.incr('coverage_stop')
+        if self.region_history is not None:
+            self.region_history.update(store_name, observed)
+
+    def _brand_ids(self, store_name, documents):
+        """
+        응답 documents 중 브랜드 매장으로 판단되는 id (relevance 점수 기준, 커버리지 조기 종료 판단용)
+        """
+        if not documents:
+            return []
+        frame = pd.DataFrame(documents, columns=['id', 'place_name', 'category_name'])
+        threshold, patterns = DEFAULT_THRESHOLD, None
+        if self.relevance is not None:
+            threshold, patterns = self.relevance.threshold, self.relevance.patterns.get(store_name)
+        return frame['id'][relevance_scores(frame, store_name, patterns) >= threshold]
+
+    def _sido_plan(self, store_name, previous, observed, regions, emit, stop=None, chunk_size=None):
+        """
+        시도 단위 검색 계획. 0건 시도는 건너뛰고, 45건 이하 시도는 첫 응답을 emit 하고 2페이지부터 regions 에 추가.
+        45건 초과 시도(지난 기록 기준 포함)와 구가 하나뿐인 시도(세종 등)의 구 목록을 return -> 구/동 검색 대상
+        """
+        sidos = self._by_density(previous, list(self.sido_index.items()), lambda item: f"{store_name} {item[0]}",
+                                 lambda item: sum(len(value['dong']) for value in item[1]))
+        gu_values = []
+        probe = []
+        for sido, gus in sidos:
+            sido_query = f"{store_name} {sido}"
+            if len(gus) == 1 or previous.get(sido_query, (0,))[0] > 45:
+                gu_values.extend(gus)
+            elif self._should_probe(previous, sido_query):
+                probe.append((sido_query, gus))
+            # 그 외: 지난번 0건, 재확인 주기 전
+
+        def on_sido(k, sido_first):
+            sido_query, gus = probe[k]
+            if not sido_first or 'meta' not in sido_first:
+                gu_values.extend(gus)
+                return
+            count = sido_first['meta']['total_count']
+            observed[sido_query] = count
+            if count == 0:
+                return
+            if count <= 45:
+                emit(sido_first)
+                if not self.check_stop(sido_first):
+                    regions.append((sido_query, None, 2))
+                return
+            gu_values.extend(gus)
 
-        all_collected_df = self.data_transform(all_collected)
-        return all_collected_df
+        yield from self._probe_plan([(sido_query, 1) for sido_query, _ in probe], on_sido, stop, chunk_size)
+        return gu_values
+
+    @staticmethod
+    def _by_density(previous, items, query_of, size_of):
+        """
+        예상 매장 밀도 순 정렬: 지난 수집 total_count 가 큰 지역 먼저, 기록이 없으면 size_of(동 개수, 인구 규모 대용) 순
+        """
+        return sorted(items, key=lambda item: (-previous.get(query_of(item), (0,))[0], -size_of(item)))
+
+    def _probe_plan(self, requests, on_result, stop=None, chunk_size=None):
+        """
+        첫 페이지 요청 목록을 chunk_size 개씩(기본: 한 번에 전부) yield 하고 응답마다 on_result(요청 순번, 응답) 호출.
+        chunk 사이에 stop() 이 True 가 되면 남은 요청은 보내지 않음.
+        """
+        step = chunk_size or max(len(requests), 1)
+        for start in range(0, len(requests), step):
+            if stop is not None and stop():
+                return
+            responses = yield requests[start:start + step]
+            for k, result in enumerate(responses, start):
+                on_result(k, result)
+
+    def _previous_counts(self, store_name, total_count):
+        """
+        지난 수집의 지역별 total_count. 기록이 없거나 전국 total_count 가 늘어난 경우
+        (새 지역 진출 가능성) 빈 dict -> 전체 구/동 검색.
+        """
+        if self.region_history is None:
+            return {}
+        previous = self.region_history.load(store_name)
+        if store_name not in previous:
+            return {}
+        if total_count > previous[store_name][0]:
+            print(f"[INCREMENTAL] {store_name} 매장 수 증가 {previous[store_name][0]} -> {total_count}, 전체 지역 검색")
+            return {}
+        return previous
+
+    def _should_probe(self, previous, query):
+        """
+        지난 기록 기준으로 이번에 검색할 지역인지 판단
+        """
+        if query not in previous:
+            return True
+        count, checked_day = previous[query]
+        return count > 0 or (date.today() - checked_day).days >= self.empty_recheck_days
+
+    def _page_plan(self, regions, emit, max_pages=3, stop=None, chunk_size=None):
+        """
+        collect_data_by_region 의 여러 지역 동시 버전. 받은 응답은 바로 emit.
+        regions: [(검색어, gu_name, start_page[, rect]), ...] -> 지역별 첫 응답의 total_count 목록 return
+        chunk_size 지정 시 동시에 진행하는 지역 수를 제한 (regions 순서대로 채움), stop() 이 True 가 되면 남은 요청 중단.
+        """
+        first_counts = [None] * len(regions)
+        waiting = [(i, keyword, gu_name, start_page, extra)
+                   for i, (keyword, gu_name, start_page, *extra) in enumerate(regions) if start_page <= max_pages]
+        cursors = []
+        while cursors or waiting:
+            if stop is not None and stop():
+                break
+            free = len(waiting) if chunk_size is None else chunk_size - len(cursors)
+            cursors, waiting = cursors + waiting[:free], waiting[free:]
+            responses = yield [(keyword, page, *extra) for _, keyword, _, page, extra in cursors]
+            next_cursors = []
+            for (i, keyword, gu_name, page, extra), result in zip(cursors, responses):
+                if not result or 'documents' not in result:
+                    continue
+                if first_counts[i] is None:
+                    first_counts[i] = result['meta']['total_count']
+                emit(result)
+                if not self.check_stop(result, gu_name) and page < max_pages:
+                    next_cursors.append((i, keyword, gu_name, page + 1, extra))
+            cursors = next_cursors
+        return first_counts
+
+    def _quadtree_plan(self, store_name, emit, bounds=KOREA_RECT, max_depth=12):
+        """
+        rect 파라미터로 영역을 4분할하며 검색.
+        total_count 가 0 인 영역은 버리고, 45건 이하 영역은 페이지를 모두 수집,
+        45건 초과 영역만 다시 4분할 -> 호출 수가 행정구역 수가 아닌 실제 매장 분포에 비례.
+        max_depth 까지 분할해도 45건을 넘는 영역(같은 건물 등)은 45건까지만 수집.
+        """
+        cells = [(bounds, 0)]
+        while cells:
+            firsts = yield [(store_name, 1, self._rect_param(rect)) for rect, _ in cells]
+            regions, next_cells = [], []
+            for (rect, depth), first in zip(cells, firsts):
+                if not first or 'meta' not in first or first['meta']['total_count'] == 0:
+                    continue
+                if first['meta']['total_count'] > 45 and depth < max_depth:
+                    next_cells.extend((child, depth + 1) for child in self._split_rect(rect))
+                    continue
+                emit(first)
+                if not self.check_stop(first):
+                    regions.append((store_name, None, 2, self._rect_param(rect)))
+
+            yield from self._page_plan(regions, emit)
+            cells = next_cells
+
+    @staticmethod
+    def _split_rect(rect):
+        min_x, min_y, max_x, max_y = rect
+        mid_x, mid_y = (min_x + max_x) / 2, (min_y + max_y) / 2
+        return [
+            (min_x, min_y, mid_x, mid_y),
+            (mid_x, min_y, max_x, mid_y),
+            (min_x, mid_y, mid_x, max_y),
+            (mid_x, mid_y, max_x, max_y),
+        ]
+
+    @staticmethod
+    def _rect_param(rect):
+        return ','.join(f"{v:.6f}" for v in rect)
 
     def data_transform(self, all_collected_list):
         """
-        여러 JSON 응답을 DataFrame으로 변환
+        여러 JSON 응답을 DataFrame으로 변환 (고정 컬럼 PLACE_COLUMNS)
         """
-        new_data = []
-        for res_json in all_collected_list:
-            if len(res_json.get('documents', [])) == 0:
-                continue
-            keyword = res_json['meta']['same_name']['keyword']
-            for d in res_json['documents']:
-                d['keyword'] = keyword
-                new_data.append(d)
-        df = pd.DataFrame(new_data)
-        return df
+        return pd.DataFrame(iter_documents(all_collected_list), columns=PLACE_COLUMNS)
 
     def collect_data_by_region(self, keyword, region, gu_name=None, start_page=1, max_pages=3):
         """
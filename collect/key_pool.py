@@ -0,0 +1,198 @@
+import asyncio
+import json
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+
+class APIKeyPool:
+    """
+    api_keys.txt 의 모든 키에 요청을 동시에 분산하는 키 풀.
+    - 키별 토큰 버킷(rate_per_sec, burst)으로 초당 요청 수 제한 -> 한 키에 몰려 429 가 연달아 나는 것을 방지
+    - 키별 일일 사용량을 usage_path(json)에 저장 -> 재시작해도 남은 할당량을 알고 이어서 사용
+    - 카카오 일일 할당량은 매일 reset_hour 시(Asia/Seoul)에 초기화
+    - 모든 키가 소진되면 wait_on_exhaust=True 인 경우 초기화 시각까지 대기 후 계속, False 면 987 예외
+    """
+
+    def __init__(
+        self,
+        api_keys,
+        daily_quota=100000,
+        rate_per_sec=10.0,
+        burst=None,
+        usage_path=None,
+        reset_hour=0,
+        timezone='Asia/Seoul',
+        wait_on_exhaust=True,
+    ):
+        self.api_keys = list(api_keys)
+        self.daily_quota = daily_quota
+        self.rate_per_sec = rate_per_sec
+        self.burst = burst or max(rate_per_sec or 1, 1)
+        self.usage_path = usage_path
+        self.reset_hour = reset_hour
+        self.tz = ZoneInfo(timezone)
+        self.wait_on_exhaust = wait_on_exhaust
+
+        self.lock = threading.Lock()
+        self.next_index = 0
+        self.tokens = {key: self.burst for key in self.api_keys}
+        self.refilled_at = {key: time.monotonic() for key in self.api_keys}
+        self.throttled = {key: 0 for key in self.api_keys}
+        self.day = self._quota_day()
+        self.usage = {key: 0 for key in self.api_keys}
+        self.exhausted = set()
+        self.dirty = 0
+        self.flushed_at = time.monotonic()
+        self._load_usage()
+
+    def _quota_day(self, now=None):
+        now = now or datetime.now(self.tz)
+        return (now - timedelta(hours=self.reset_hour)).strftime('%Y-%m-%d')
+
+    def seconds_until_reset(self, now=None):
+        now = now or datetime.now(self.tz)
+        reset = now.replace(hour=self.reset_hour, minute=0, second=0, microsecond=0)
+        if reset <= now:
+            reset += timedelta(days=1)
+        return (reset - now).total_seconds()
+
+    def _load_usage(self):
+        if not self.usage_path or not os.path.exists(self.usage_path):
+            return
+        try:
+            with open(self.usage_path, encoding='utf-8') as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            return
+        if saved.get('day') != self.day:
+            # 할당량이 초기화된 다음 날이면 이전 사용량은 무시
+            return
+        for key, count in saved.get('usage', {}).items():
+            if key in self.usage:
+                self.usage[key] = count
+        self.exhausted = {key for key in saved.get('exhausted', []) if key in self.usage}
+        self.exhausted |= {key for key, count in self.usage.items() if count >= self.daily_quota}
+        print(f"[KEY POOL] 오늘 사용량 불러옴: {sum(self.usage.values())}건, 소진 키 {len(self.exhausted)}/{len(self.api_keys)}")
+
+    def _flush(self):
+        """
+        사용량을 파일에 저장. self.lock 을 잡은 상태에서 호출.
+        """
+        self.dirty = 0
+        self.flushed_at = time.monotonic()
+        if not self.usage_path:
+            return
+        dir_name = os.path.dirname(self.usage_path)
+        if dir_name:
+            os.makedirs(dir_name, exist_ok=True)
+        tmp_path = self.usage_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'day': self.day, 'usage': self.usage, 'exhausted': sorted(self.exhausted)}, f)
+        os.replace(tmp_path, self.usage_path)
+
+    def flush(self):
+        with self.lock:
+            self._flush()
+
+    def _roll_day(self):
+        """
+        할당량 초기화 시각이 지났으면 사용량/소진 상태 초기화. self.lock 을 잡은 상태에서 호출.
+        """
+        day = self._quota_day()
+        if day != self.day:
+            print(f"[KEY POOL] 일일 할당량 초기화 ({self.day} -> {day})")
+            self.day = day
+            self.usage = {key: 0 for key in self.api_keys}
+            self.exhausted = set()
+            self._flush()
+
+    def try_acquire(self):
+        """
+        사용할 키 하나를 고른다 -> (key, 0) 또는 기다려야 하는 경우 (None, 대기 초)
+        모든 키가 소진되었고 wait_on_exhaust=False 면 987 예외.
+        """
+        with self.lock:
+            self._roll_day()
+            now = time.monotonic()
+            n_keys = len(self.api_keys)
+            min_wait = None
+            for offset in range(n_keys):
+                key = self.api_keys[(self.next_index + offset) % n_keys]
+                if key in self.exhausted:
+                    continue
+                if self.rate_per_sec:
+                    tokens = min(self.burst, self.tokens[key] + (now - self.refilled_at[key]) * self.rate_per_sec)
+                    self.tokens[key] = tokens
+                    self.refilled_at[key] = now
+                    if tokens < 1:
+                        wait = (1 - tokens) / self.rate_per_sec
+                        min_wait = wait if min_wait is None else min(min_wait, wait)
+                        continue
+                    self.tokens[key] = tokens - 1
+
+                self.next_index = (self.next_index + offset + 1) % n_keys
+                self.usage[key] += 1
+                if self.usage[key] >= self.daily_quota:
+                    self.exhausted.add(key)
+                self.dirty += 1
+                if self.dirty >= 100 or now - self.flushed_at > 10:
+                    self._flush()
+                return key, 0
+
+            if min_wait is not None:
+                return None, min_wait
+
+            # 모든 키 소진
+            self._flush()
+            if not self.wait_on_exhaust:
+                raise Exception(987, "모든 API 키 소진")
+            return None, self.seconds_until_reset() + 1
+
+    def acquire(self):
+        """
+        키를 얻을 때까지 대기 (초당 제한 / 일일 할당량 초기화)
+        """
+        while True:
+            key, wait = self.try_acquire()
+            if key is not None:
+                return key
+            self._log_wait(wait)
+            time.sleep(min(wait, 600))
+
+    async def acquire_async(self):
+        while True:
+            key, wait = self.try_acquire()
+            if key is not None:
+                return key
+            self._log_wait(wait)
+            await asyncio.sleep(min(wait, 600))
+
+    def _log_wait(self, wait):
+        if wait > 60:
+            print(f"[KEY POOL] 모든 API 키 소진 -> 할당량 초기화까지 {wait / 3600:.1f}시간 대기")
+
+    def mark_throttled(self, key):
+        """
+        429(RequestThrottled) 응답을 받은 키 -> 오늘은 더 이상 사용하지 않음
+        """
+        with self.lock:
+            self.throttled[key] += 1
+            if key not in self.exhausted:
+                self.exhausted.add(key)
+                remaining = len(self.api_keys) - len(self.exhausted)
+                print(f"[API KEY EXHAUSTED] {key} (사용 {self.usage[key]}건), 남은 키 {remaining}개")
+            self._flush()
+
+    def stats(self):
+        with self.lock:
+            return {
+                'day': self.day,
+                'usage': dict(self.usage),
+                'throttled': dict(self.throttled),
+                'exhausted': len(self.exhausted),
+                'remaining_quota': sum(max(self.daily_quota - count, 0)
+                                       for key, count in self.usage.items() if key not in self.exhausted),
+            }
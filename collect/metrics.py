@@ -0,0 +1,206 @@
+import bisect
+import json
+import os
+import threading
+import time
+
+# get_places 네트워크 요청 지연 히스토그램 구간(초)
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# 브랜드 요청 분류: flat(브랜드명 전국 검색) / sido / gu / dong / quadtree(rect)
+STRATEGIES = ('flat', 'sido', 'gu', 'dong', 'quadtree')
+# 응답 출처: api(할당량 사용) / cache / journal
+SOURCES = ('api', 'cache', 'journal')
+
+
+def _mask_key(api_key):
+    """
+    파일에 API 키 원문을 남기지 않도록 끝 6자리만 사용
+    """
+    return '...' + api_key[-6:]
+
+
+class Metrics:
+    """
+    수집 지표 (스레드 안전).
+    - 키별 요청 수 / 응답 상태, 429 비율, get_places 네트워크 지연 히스토그램
+    - 브랜드별 요청 수(전략 flat/gu/dong/quadtree x 출처 api/cache/journal), 수집 시간, 저장 행 수
+    - 이벤트 횟수: 재시도, hedging 등
+    - gauge: 작업 큐 길이 등 등록한 함수의 현재 값
+    path 를 지정하면 flush_seconds 마다 path(json) 와 같은 이름의 .prom(Prometheus text) 파일로 저장.
+    """
+
+    def __init__(self, path=None, flush_seconds=30):
+        self.path = path
+        self.flush_seconds = flush_seconds
+        self.lock = threading.Lock()
+        self.started_at = time.time()
+
+        self.key_requests = {}
+        self.status_counts = {}
+        self.latency_buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.latency_sum = 0.0
+        self.latency_count = 0
+        self.brands = {}
+        self.brand_started = {}
+        self.gauges = {}
+        self.events = {}
+
+        self.stop_event = threading.Event()
+        self.flusher = None
+        if path:
+            dir_name = os.path.dirname(path)
+            if dir_name:
+                os.makedirs(dir_name, exist_ok=True)
+            self.flusher = threading.Thread(target=self._flush_loop, daemon=True)
+            self.flusher.start()
+
+    @property
+    def api_calls(self):
+        with self.lock:
+            return sum(self.status_counts.values())
+
+    def request(self, api_key, status, seconds):
+        """
+        API 요청 한 건 (status: HTTP 상태 코드 또는 'error')
+        """
+        key = _mask_key(api_key)
+        status = str(status)
+        with self.lock:
+            per_key = self.key_requests.setdefault(key, {})
+            per_key[status] = per_key.get(status, 0) + 1
+            self.status_counts[status] = self.status_counts.get(status, 0) + 1
+            self.latency_buckets[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+            self.latency_sum += seconds
+            self.latency_count += 1
+
+    def incr(self, name, n=1):
+        """
+        이벤트 횟수 (retry, hedged 등)
+        """
+        with self.lock:
+            self.events[name] = self.events.get(name, 0) + n
+
+    def brand_start(self, brand):
+        with self.lock:
+            self.brand_started[brand] = time.monotonic()
+
+    def brand_request(self, brand, strategy, source):
+        with self.lock:
+            calls = self.brands.setdefault(brand, {}).setdefault('calls', {})
+            key = f"{strategy}.{source}"
+            calls[key] = calls.get(key, 0) + 1
+
+    def brand_finish(self, brand, rows):
+        with self.lock:
+            started = self.brand_started.pop(brand, None)
+            stats = self.brands.setdefault(brand, {})
+            stats['rows'] = rows
+            if started is not None:
+                stats['seconds'] = round(time.monotonic() - started, 3)
+
+    def set_gauge(self, name, func):
+        """
+        flush 때마다 func() 값을 기록하는 gauge 등록 (func=None 이면 제거)
+        """
+        with self.lock:
+            if func is None:
+                self.gauges.pop(name, None)
+            else:
+                self.gauges[name] = func
+
+    def snapshot(self):
+        with self.lock:
+            gauges = dict(self.gauges)
+            total = sum(self.status_counts.values())
+            throttled = self.status_counts.get('429', 0)
+            strategy_calls = {}
+            for stats in self.brands.values():
+                for key, count in stats.get('calls', {}).items():
+                    strategy_calls[key] = strategy_calls.get(key, 0) + count
+            snapshot = {
+                'updated_at': time.time(),
+                'uptime_sec': round(time.time() - self.started_at, 3),
+                'api_calls': total,
+                'throttled_429': throttled,
+                'throttled_rate': throttled / total if total else 0.0,
+                'status': dict(self.status_counts),
+                'keys': {key: dict(counts) for key, counts in self.key_requests.items()},
+                'latency': {
+                    'buckets': dict(zip([str(b) for b in LATENCY_BUCKETS] + ['+Inf'], self.latency_buckets)),
+                    'sum': self.latency_sum,
+                    'count': self.latency_count,
+                },
+                'events': dict(self.events),
+                'strategy_calls': strategy_calls,
+                'brands': {brand: {k: (dict(v) if isinstance(v, dict) else v) for k, v in stats.items()}
+                           for brand, stats in self.brands.items()},
+            }
+        # gauge 함수는 다른 lock 을 잡을 수 있어 self.lock 밖에서 호출
+        snapshot['gauges'] = {}
+        for name, func in gauges.items():
+            try:
+                snapshot['gauges'][name] = func()
+            except Exception:
+                continue
+        return snapshot
+
+    @staticmethod
+    def _prometheus(snapshot):
+        lines = [
+            '# TYPE kakao_api_requests_total counter',
+        ]
+        for key, counts in snapshot['keys'].items():
+            for status, count in counts.items():
+                lines.append(f'kakao_api_requests_total{{key="{key}",status="{status}"}} {count}')
+        lines.append('# TYPE kakao_api_throttled_ratio gauge')
+        lines.append(f"kakao_api_throttled_ratio {snapshot['throttled_rate']}")
+
+        lines.append('# TYPE kakao_request_latency_seconds histogram')
+        cumulative = 0
+        for le, count in snapshot['latency']['buckets'].items():
+            cumulative += count
+            lines.append(f'kakao_request_latency_seconds_bucket{{le="{le}"}} {cumulative}')
+        lines.append(f"kakao_request_latency_seconds_sum {snapshot['latency']['sum']}")
+        lines.append(f"kakao_request_latency_seconds_count {snapshot['latency']['count']}")
+
+        for name, count in sorted(snapshot['events'].items()):
+            lines.append(f'# TYPE kakao_{name}_total counter')
+            lines.append(f'kakao_{name}_total {count}')
+
+        lines.append('# TYPE kakao_brand_requests_total counter')
+        for key, count in sorted(snapshot['strategy_calls'].items()):
+            strategy, source = key.split('.')
+            lines.append(f'kakao_brand_requests_total{{strategy="{strategy}",source="{source}"}} {count}')
+        finished = [stats for stats in snapshot['brands'].values() if 'rows' in stats]
+        lines.append('# TYPE kakao_brands_finished_total counter')
+        lines.append(f'kakao_brands_finished_total {len(finished)}')
+        lines.append('# TYPE kakao_brand_seconds_total counter')
+        lines.append(f"kakao_brand_seconds_total {sum(stats.get('seconds', 0) for stats in finished)}")
+
+        for name, value in sorted(snapshot['gauges'].items()):
+            lines.append(f'# TYPE kakao_{name} gauge')
+            lines.append(f'kakao_{name} {value}')
+        return '\n'.join(lines) + '\n'
+
+    def flush(self):
+        """
+        path(json) / .prom 파일로 저장
+        """
+        if not self.path:
+            return
+        snapshot = self.snapshot()
+        prom_path = os.path.splitext(self.path)[0] + '.prom'
+        for file_path, text in ((self.path, json.dumps(snapshot, ensure_ascii=False)),
+                                (prom_path, self._prometheus(snapshot))):
+            tmp_path = file_path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(text)
+            os.replace(tmp_path, file_path)
+
+    def _flush_loop(self):
+        while not self.stop_event.wait(self.flush_seconds):
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"[METRICS] 저장 실패: {e}")
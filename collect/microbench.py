@@ -0,0 +1,309 @@
+"""
+네트워크 없이 도는 수집 로직(검색어 변환 / 지역 인덱스 / 응답 변환 / 진행 저장) 마이크로 벤치마크.
+결과를 json 으로 저장하고, 기준(baseline) json 과 비교해 느려진 항목을 표시한다.
+
+python -m collect.microbench --out ./cache/microbench.json
+python -m collect.microbench --save-baseline ./cache/microbench_baseline.json
+python -m collect.microbench --baseline ./cache/microbench_baseline.json --tolerance 0.2
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from collect.kakao_api import KakaoAPIManager
+from collect.normalize import normalize_names
+from collect.region_index import build_region_index, load_region_index
+
+# 기준 대비 이 비율 이상 느려지면 regression
+DEFAULT_TOLERANCE = 0.2
+
+
+def _measure(fn, repeat):
+    """
+    fn() 을 repeat 번 실행한 시간(초) 통계
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return {
+        'repeat': repeat,
+        'min_sec': round(min(times), 6),
+        'median_sec': round(statistics.median(times), 6),
+        'mean_sec': round(statistics.fmean(times), 6),
+    }
+
+
+def _synthetic_responses(n_responses, seed=0, brand='가상브랜드'):
+    """
+    카카오 응답과 같은 구조의 가상 JSON 응답 목록 (응답당 15건)
+    """
+    rng = random.Random(seed)
+    responses = []
+    next_id = 10000000
+    for _ in range(n_responses):
+        docs = []
+        for _ in range(15):
+            next_id += 1
+            docs.append({
+                'address_name': f"서울 강남구 역삼동 {rng.randint(1, 999)}-{rng.randint(1, 30)}",
+                'category_group_code': 'FD6',
+                'category_group_name': '음식점',
+                'category_name': f"음식점 > 카페 > 커피전문점 > {brand}",
+                'distance': '',
+                'id': str(next_id),
+                'phone': f"02-{rng.randint(100, 9999)}-{rng.randint(1000, 9999)}",
+                'place_name': f"{brand} 역삼{rng.randint(1, 99)}점",
+                'place_url': f"http://place.map.kakao.com/{next_id}",
+                'road_address_name': f"서울 강남구 테헤란로 {rng.randint(1, 500)}",
+                'x': f"{127 + rng.uniform(-0.05, 0.05):.6f}",
+                'y': f"{37.5 + rng.uniform(-0.05, 0.05):.6f}",
+            })
+        responses.append({
+            'documents': docs,
+            'meta': {'is_end': False, 'pageable_count': 45,
+                     'same_name': {'keyword': brand, 'region': [], 'selected_region': ''}, 'total_count': 45},
+        })
+    return responses
+
+
+def _make_manager(work_dir, target_path, guso_path, storage):
+    api_key_path = os.path.join(work_dir, 'api_keys.txt')
+    with open(api_key_path, 'w') as f:
+        f.write('benchkey000')
+    with contextlib.redirect_stdout(io.StringIO()):
+        return KakaoAPIManager(
+            api_key_path=api_key_path,
+            target_path=target_path,
+            guso_path=guso_path,
+            progress_file_path=os.path.join(work_dir, f'save_{storage}_{time.monotonic_ns()}'),
+            key_rate_per_sec=None,
+            wait_on_exhaust=False,
+            storage=storage,
+        )
+
+
+def bench_save_progress(target_path, guso_path, storage='csv', total_rows=12000, batch_rows=500, seed=0):
+    """
+    브랜드 하나의 파일이 batch_rows 씩 total_rows 까지 커지는 동안의 _save_progress 시간
+    (csv 는 매번 기존 파일을 읽고-합치고-다시 씀). 전체 시간과 마지막(가장 큰 파일) 저장 시간을 반환.
+    """
+    responses = _synthetic_responses(total_rows // 15 + 1, seed=seed)
+    with tempfile.TemporaryDirectory() as work_dir:
+        manager = _make_manager(work_dir, target_path, guso_path, storage)
+        if manager.store is not None:
+            # writer 의 모아 쓰기 대기(batch_seconds) 없이 실제 기록 시간만 측정
+            manager.store.batch_seconds = 0
+        data = manager.data_transform(responses).iloc[:total_rows]
+        batches = [data.iloc[start:start + batch_rows] for start in range(0, len(data), batch_rows)]
+        times = []
+        for batch in batches:
+            start = time.perf_counter()
+            manager._save_progress(batch, '가상브랜드')
+            if manager.store is not None:
+                manager.store.flush()
+            times.append(time.perf_counter() - start)
+        if manager.store is not None:
+            manager.store.close()
+    return sum(times), times[-1]
+
+
+CASES = {}
+
+
+def _case(name):
+    def register(fn):
+        CASES[name] = fn
+        return fn
+    return register
+
+
+@_case('name_change')
+def _bench_name_change(ctx, repeat):
+    """data.tsv 전체 영업표지 -> 검색어 (행마다 _name_change)"""
+    names = ctx['target_df']['영업표지'].astype(str)
+    result = _measure(lambda: names.map(ctx['manager']._name_change), repeat)
+    result['rows'] = len(names)
+    return result
+
+
+@_case('name_change_column')
+def _bench_name_change_column(ctx, repeat):
+    """data.tsv 전체 영업표지 -> 검색어 (normalize_names 컬럼 단위)"""
+    names = ctx['target_df']['영업표지']
+    result = _measure(lambda: normalize_names(names), repeat)
+    result['rows'] = len(names)
+    return result
+
+
+@_case('guso_index_build')
+def _bench_guso_index_build(ctx, repeat):
+    """시군구동 xlsx 읽기 + 지역 인덱스(guso_index) 생성"""
+    result = _measure(lambda: build_region_index(pd.read_excel(ctx['guso_path'])), repeat)
+    result['rows'] = ctx['guso_rows']
+    return result
+
+
+@_case('guso_index_cached')
+def _bench_guso_index_cached(ctx, repeat):
+    """캐시가 있는 경우의 지역 인덱스 로드 (load_region_index)"""
+    cache_path = os.path.join(ctx['work_dir'], 'guso.index.pkl')
+    with contextlib.redirect_stdout(io.StringIO()):
+        load_region_index(ctx['guso_path'], cache_path=cache_path)
+    result = _measure(lambda: load_region_index(ctx['guso_path'], cache_path=cache_path), repeat)
+    result['rows'] = ctx['guso_rows']
+    return result
+
+
+@_case('data_transform')
+def _bench_data_transform(ctx, repeat):
+    """가상 응답 (응답 2000개 x 15건) -> DataFrame"""
+    responses = _synthetic_responses(2000, seed=ctx['seed'])
+    result = _measure(lambda: ctx['manager'].data_transform(responses), repeat)
+    result['rows'] = 2000 * 15
+    return result
+
+
+@_case('save_progress_csv')
+def _bench_save_progress_csv(ctx, repeat):
+    """csv 저장: 브랜드 파일이 500행씩 12000행까지 커질 때의 _save_progress 합계"""
+    return _bench_save_progress(ctx, repeat, 'csv')
+
+
+@_case('save_progress_sqlite')
+def _bench_save_progress_sqlite(ctx, repeat):
+    """sqlite 저장: 같은 조건에서 _save_progress + 기록 완료(flush) 합계"""
+    return _bench_save_progress(ctx, repeat, 'sqlite')
+
+
+def _bench_save_progress(ctx, repeat, storage):
+    runs = [bench_save_progress(ctx['target_path'], ctx['guso_path'], storage, seed=ctx['seed']) for _ in range(repeat)]
+    totals = [total for total, _ in runs]
+    return {
+        'repeat': repeat,
+        'min_sec': round(min(totals), 6),
+        'median_sec': round(statistics.median(totals), 6),
+        'mean_sec': round(statistics.fmean(totals), 6),
+        'last_save_sec': round(statistics.median(last for _, last in runs), 6),
+        'rows': 12000,
+    }
+
+
+def run_microbench(target_path='./data/data.tsv', guso_path='./data/API_카카오_시군구동_20241217.xlsx',
+                   repeat=5, cases=None, seed=0):
+    """
+    선택한 항목(cases, 기본 전체)을 측정한 결과 dict (환경 정보 + 항목별 시간)
+    """
+    names = cases or list(CASES)
+    unknown = [name for name in names if name not in CASES]
+    if unknown:
+        raise ValueError(f"없는 항목: {unknown} (가능: {list(CASES)})")
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        ctx = {
+            'work_dir': work_dir,
+            'target_path': target_path,
+            'guso_path': guso_path,
+            'target_df': pd.read_csv(target_path, sep='\t'),
+            'guso_rows': len(pd.read_excel(guso_path)),
+            'seed': seed,
+        }
+        ctx['manager'] = _make_manager(work_dir, target_path, guso_path, 'csv')
+        results = {}
+        for name in names:
+            results[name] = CASES[name](ctx, repeat)
+            print(f"[MICROBENCH] {name:>22}: median {results[name]['median_sec']:.4f}s "
+                  f"(min {results[name]['min_sec']:.4f}s, {results[name]['rows']}행)")
+
+    return {
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+        'cases': results,
+    }
+
+
+def compare(result, baseline, tolerance=DEFAULT_TOLERANCE):
+    """
+    항목별 median 시간 비교 -> {항목: {'baseline_sec', 'current_sec', 'ratio', 'regression'}}
+    ratio 가 1 + tolerance 를 넘으면 regression (기준에 없는 항목은 제외)
+    """
+    report = {}
+    for name, current in result['cases'].items():
+        base = baseline.get('cases', {}).get(name)
+        if not base or not base.get('median_sec'):
+            continue
+        ratio = current['median_sec'] / base['median_sec']
+        report[name] = {
+            'baseline_sec': base['median_sec'],
+            'current_sec': current['median_sec'],
+            'ratio': round(ratio, 3),
+            'regression': ratio > 1 + tolerance,
+        }
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='수집 로직 마이크로 벤치마크 (네트워크 없음)')
+    parser.add_argument('--target-path', default='./data/data.tsv')
+    parser.add_argument('--guso-path', default='./data/API_카카오_시군구동_20241217.xlsx')
+    parser.add_argument('--repeat', type=int, default=5, help='항목별 반복 횟수 (median 사용)')
+    parser.add_argument('--cases', default=None, help=f"쉼표로 구분한 항목 (기본 전체: {','.join(CASES)})")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--out', default=None, help='결과를 저장할 json 경로')
+    parser.add_argument('--baseline', default=None, help='비교할 기준 json 경로')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE, help='허용 지연 비율 (0.2 = 20%%)')
+    parser.add_argument('--save-baseline', default=None, help='이번 결과를 기준 json 으로 저장')
+    args = parser.parse_args(argv)
+
+    result = run_microbench(
+        target_path=args.target_path,
+        guso_path=args.guso_path,
+        repeat=args.repeat,
+        cases=args.cases.split(',') if args.cases else None,
+        seed=args.seed,
+    )
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        result['baseline'] = {'path': args.baseline, 'created_at': baseline.get('created_at'),
+                              'tolerance': args.tolerance}
+        result['comparison'] = compare(result, baseline, args.tolerance)
+        for name, row in result['comparison'].items():
+            mark = 'REGRESSION' if row['regression'] else 'ok'
+            print(f"[MICROBENCH] {name:>22}: {row['baseline_sec']:.4f}s -> {row['current_sec']:.4f}s "
+                  f"(x{row['ratio']:.2f}) {mark}")
+            if row['regression']:
+                regressions.append(name)
+
+    for path in (args.out, args.save_baseline):
+        if path:
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(result, f, ensure_ascii=False, indent=2)
+            print(f"[MICROBENCH] {path} 저장")
+
+    if regressions:
+        print(f"[MICROBENCH] 기준보다 {args.tolerance:.0%} 넘게 느려진 항목: {', '.join(regressions)}")
+        sys.exit(1)
+    return result
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+import re
+
+import pandas as pd
+
+_BRACKET = re.compile(r"\(([^)]+)\)")
+_BEFORE_BRACKET = re.compile(r"(\S+)\s*\([^)]*\)")
+_NOT_ALLOWED = re.compile(r"[^가-힣0-9a-zA-Z\s]")
+
+
+def _resolve_bracket(name):
+    """
+    괄호 () 가 있는 이름 -> 괄호 앞 단어와 괄호 안 텍스트 중 영어(문자)가 적은 쪽만 남김
+    """
+    match = _BRACKET.search(name)
+    if not match:
+        return name
+    inside_bracket = match.group(1)  # 괄호 안 텍스트
+    before_bracket_match = _BEFORE_BRACKET.search(name)
+    if not before_bracket_match:
+        return name
+    before_bracket = before_bracket_match.group(1)  # 괄호 앞 단어
+
+    # 영어 개수 비교
+    before_eng_count = sum(1 for c in before_bracket if c.isalpha())
+    inside_eng_count = sum(1 for c in inside_bracket if c.isalpha())
+
+    # 영어가 더 많은 쪽을 제거하고, 영어가 적은 쪽을 유지
+    if inside_eng_count > before_eng_count:
+        return name.replace(f"({inside_bracket})", "").strip()
+    return name.replace(before_bracket, "").replace(f"({inside_bracket})", inside_bracket).strip()
+
+
+def normalize_name(name):
+    """
+    영업표지 하나 -> 검색어 (KakaoAPIManager._name_change)
+    """
+    name = _resolve_bracket(name.replace('(주)', ''))
+    # 한글, 숫자, 영어만 남기기
+    return _NOT_ALLOWED.sub("", name)
+
+
+def normalize_names(names):
+    """
+    영업표지 컬럼 전체 -> 검색어 Series (normalize_name 과 같은 결과).
+    같은 이름은 한 번만 변환 -> 중복이 많으면 행마다 map 보다 빠르고, data.tsv 처럼 거의 모두 고유하면 비슷함.
+    """
+    names = names.astype(str)
+    cache = {}
+    queries = []
+    for name in names:
+        query = cache.get(name)
+        if query is None:
+            query = cache[name] = normalize_name(name)
+        queries.append(query)
+    return pd.Series(queries, index=names.index, name=names.name)
+
+
+def build_query_table(target_df, column='영업표지'):
+    """
+    영업표지 -> 검색어 변환 후 같은 검색어끼리 묶은 표.
+    index: 검색어 (처음 나온 순서), target_index: 처음 나온 행 index, target_rows: 해당 검색어의 모든 행 index
+    -> 검색어마다 API 수집은 한 번만.
+    """
+    queries = normalize_names(target_df[column])
+    codes, uniques = pd.factorize(queries)
+    target_rows = [[] for _ in range(len(uniques))]
+    for code, index in zip(codes, target_df.index):
+        target_rows[code].append(index)
+    table = pd.DataFrame({
+        'target_index': [rows[0] for rows in target_rows],
+        'target_rows': target_rows,
+        'n_rows': [len(rows) for rows in target_rows],
+    }, index=pd.Index(uniques, name='query'))
+    return table
@@ -0,0 +1,85 @@
+import pandas as pd
+
+from collect.store import PLACE_COLUMNS
+
+ID_INDEX = PLACE_COLUMNS.index('id')
+DOC_COLUMNS = [c for c in PLACE_COLUMNS if c != 'keyword']
+
+
+def iter_documents(responses):
+    """
+    JSON 응답 iterable -> PLACE_COLUMNS 순서의 고정 스키마 tuple generator
+    응답 원문(dict)을 수정하거나 복사해 쌓아두지 않는다.
+    """
+    for res_json in responses:
+        docs = res_json.get('documents') or []
+        if not docs:
+            continue
+        keyword = res_json['meta']['same_name']['keyword']
+        for d in docs:
+            yield tuple(d.get(c, '') for c in DOC_COLUMNS) + (keyword,)
+
+
+class DocumentStream:
+    """
+    브랜드 하나의 수집 결과를 흘려보내는 파이프라인.
+    응답이 도착하는 즉시 document 를 고정 스키마 tuple 로 평탄화하고, id 집합으로 중복을 제거한 뒤
+    batch_size 개씩 on_batch(DataFrame) 로 넘긴다. on_batch 가 없으면 중복 제거된 tuple 만 모아둔다.
+    row_filter(store_name, DataFrame) -> (DataFrame, 기준 미만 행 수) 지정 시 넘기기 전에 적용 (collect.relevance)
+    -> 브랜드당 메모리는 원본 응답 크기가 아닌 (고유 매장 수 x 고정 컬럼) 또는 batch_size 로 제한.
+    """
+
+    def __init__(self, store_name, on_batch=None, batch_size=500, row_filter=None):
+        self.store_name = store_name
+        self.on_batch = on_batch
+        self.row_filter = row_filter
+        self.batch_size = batch_size
+        self.seen = set()
+        self.rows = []
+        self.total = 0
+        self.written = 0
+        self.flagged = 0
+        self.dropped = 0
+
+    def add(self, response):
+        """
+        응답 한 건 추가 (검색 계획의 emit)
+        """
+        if not response:
+            return
+        for row in iter_documents((response,)):
+            self.total += 1
+            place_id = row[ID_INDEX]
+            if place_id in self.seen:
+                continue
+            self.seen.add(place_id)
+            self.rows.append(row)
+        if self.on_batch is not None and len(self.rows) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if self.on_batch is not None and self.rows:
+            frame = self.to_frame()
+            self.on_batch(frame)
+            self.written += len(frame)
+            self.rows = []
+
+    def to_frame(self):
+        frame = pd.DataFrame(self.rows, columns=PLACE_COLUMNS)
+        if self.row_filter is not None:
+            kept, flagged = self.row_filter(self.store_name, frame)
+            self.flagged += flagged
+            self.dropped += len(frame) - len(kept)
+            frame = kept
+        return frame
+
+    @property
+    def unique(self):
+        return len(self.seen)
+
+    @property
+    def kept(self):
+        """
+        저장 대상 행 수 (중복 제거 후 row_filter 로 버린 행 제외)
+        """
+        return len(self.seen) - self.dropped
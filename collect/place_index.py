@@ -0,0 +1,224 @@
+import math
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+import pandas as pd
+
+# 같은 id 의 좌표가 이 거리(m) 이상 바뀌면 이전(moved)으로 판단
+MOVE_METERS = 30
+
+DIFF_COLUMNS = ['event', 'id', 'brand', 'place_name', 'road_address_name', 'x', 'y', 'prev_x', 'prev_y']
+
+
+def _meters(x1, y1, x2, y2):
+    """
+    경위도 두 점 사이 거리(m) - 짧은 거리용 근사
+    """
+    dx = (x2 - x1) * math.cos(math.radians((y1 + y2) / 2)) * 111320
+    dy = (y2 - y1) * 110540
+    return math.hypot(dx, dy)
+
+
+def _float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class PlaceIndex:
+    """
+    전체 브랜드 공통 매장 인덱스 (SQLite, 카카오 place id 기준).
+    - 매장별 brand, 좌표, first_seen / last_seen 기록 -> 브랜드 수집이 끝날 때마다 갱신
+    - 실행 중 발생한 변화는 place_event 에 기록
+        opened: 이미 추적 중인 브랜드에서 처음 본 매장
+        closed: 이번 실행에서 브랜드 수집이 끝났는데 보이지 않은 매장
+        moved : 좌표가 MOVE_METERS 이상 바뀐 매장
+    - write_diff() 로 이번 실행의 변화만 csv 로 내보내 후속 작업은 변경분만 읽으면 된다.
+    처음 추적하는 브랜드의 매장은 기준선(baseline)으로만 기록하고 opened 로 보지 않는다.
+    """
+
+    def __init__(self, path='./save_data/place_index.sqlite'):
+        dir_name = os.path.dirname(path)
+        if dir_name:
+            os.makedirs(dir_name, exist_ok=True)
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False, timeout=60)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS place_index (
+                id TEXT PRIMARY KEY,
+                brand TEXT NOT NULL,
+                place_name TEXT,
+                road_address_name TEXT,
+                x REAL,
+                y REAL,
+                first_seen REAL NOT NULL,
+                last_seen REAL NOT NULL,
+                closed_at REAL
+            )
+            """
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS place_index_brand ON place_index (brand)")
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS place_event (
+                run_started REAL NOT NULL,
+                at REAL NOT NULL,
+                event TEXT NOT NULL,
+                id TEXT NOT NULL,
+                brand TEXT NOT NULL,
+                place_name TEXT,
+                road_address_name TEXT,
+                x REAL,
+                y REAL,
+                prev_x REAL,
+                prev_y REAL
+            )
+            """
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS place_event_run ON place_event (run_started)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS place_event_at ON place_event (at)")
+        self.conn.commit()
+        self.begin_run()
+
+    def begin_run(self):
+        """
+        새 실행 시작 -> 이 시각 이후 보지 못한 매장이 폐점 후보
+        """
+        with self.lock:
+            self.run_started = time.time()
+            self.known_brands = {row[0] for row in self.conn.execute("SELECT DISTINCT brand FROM place_index")}
+            self.seen_counts = {}
+
+    def observe(self, brand, data):
+        """
+        브랜드 수집 결과 일부(DataFrame, PLACE_COLUMNS) 반영
+        """
+        if len(data) == 0:
+            return
+        now = time.time()
+        rows = data[['id', 'place_name', 'road_address_name', 'x', 'y']]
+        rows = rows.astype(object).where(rows.notna(), None)
+        with self.lock:
+            baseline = brand not in self.known_brands
+            self.seen_counts[brand] = self.seen_counts.get(brand, 0) + len(rows)
+            ids = [str(place_id) for place_id in rows['id']]
+            previous = {}
+            for start in range(0, len(ids), 500):
+                chunk = ids[start:start + 500]
+                marks = ', '.join('?' for _ in chunk)
+                for place_id, x, y, closed_at in self.conn.execute(
+                    f"SELECT id, x, y, closed_at FROM place_index WHERE id IN ({marks})", chunk
+                ):
+                    previous[place_id] = (x, y, closed_at)
+
+            events = []
+            upserts = []
+            for place_id, (_, name, road, x, y) in zip(ids, rows.itertuples(index=False, name=None)):
+                x, y = _float(x), _float(y)
+                if place_id not in previous:
+                    if not baseline:
+                        events.append(('opened', place_id, brand, name, road, x, y, None, None))
+                    upserts.append((place_id, brand, name, road, x, y, now, now))
+                    continue
+                prev_x, prev_y, closed_at = previous[place_id]
+                if closed_at is not None:
+                    # 폐점 처리했던 매장이 다시 보임
+                    events.append(('opened', place_id, brand, name, road, x, y, None, None))
+                elif None not in (x, y, prev_x, prev_y) and _meters(prev_x, prev_y, x, y) >= MOVE_METERS:
+                    events.append(('moved', place_id, brand, name, road, x, y, prev_x, prev_y))
+                upserts.append((place_id, brand, name, road, x, y, now, now))
+
+            with self.conn:
+                self.conn.executemany(
+                    """
+                    INSERT INTO place_index (id, brand, place_name, road_address_name, x, y, first_seen, last_seen)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(id) DO UPDATE SET brand = excluded.brand, place_name = excluded.place_name,
+                        road_address_name = excluded.road_address_name, x = excluded.x, y = excluded.y,
+                        last_seen = excluded.last_seen, closed_at = NULL
+                    """,
+                    upserts,
+                )
+                self._add_events(events, now)
+
+    def finish_brand(self, brand):
+        """
+        브랜드 수집 완료 -> 이번 실행에서 보이지 않은 매장을 폐점 처리
+        """
+        now = time.time()
+        with self.lock:
+            if brand not in self.known_brands:
+                return
+            if self.seen_counts.get(brand, 0) == 0:
+                # 검색 결과가 통째로 비는 경우는 일시적인 오류일 수 있어 폐점 처리하지 않음
+                print(f"[PLACE INDEX] {brand} 이번 수집 결과 0건 -> 폐점 판단 보류")
+                return
+            closed = self.conn.execute(
+                """
+                SELECT id, brand, place_name, road_address_name, x, y FROM place_index
+                WHERE brand = ? AND last_seen < ? AND closed_at IS NULL
+                """,
+                (brand, self.run_started),
+            ).fetchall()
+            if not closed:
+                return
+            with self.conn:
+                self.conn.executemany(
+                    "UPDATE place_index SET closed_at = ? WHERE id = ?", [(now, row[0]) for row in closed]
+                )
+                self._add_events([('closed', *row, None, None) for row in closed], now)
+
+    def _add_events(self, events, now):
+        """
+        self.lock 을 잡은 상태에서 호출.
+        """
+        self.conn.executemany(
+            """
+            INSERT INTO place_event (run_started, at, event, id, brand, place_name, road_address_name, x, y, prev_x, prev_y)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            [(self.run_started, now, *event) for event in events],
+        )
+
+    def change_counts(self, since):
+        """
+        since(epoch) 이후 브랜드별 변화(신규/폐점/이전) 수 -> {brand: count}
+        """
+        with self.lock:
+            return dict(self.conn.execute(
+                "SELECT brand, COUNT(*) FROM place_event WHERE at >= ? GROUP BY brand", (since,)
+            ).fetchall())
+
+    def diff(self, run_started=None):
+        """
+        실행 한 번의 변화 목록 (기본: 현재 실행)
+        """
+        with self.lock:
+            return pd.read_sql_query(
+                f"SELECT {', '.join(DIFF_COLUMNS)} FROM place_event WHERE run_started = ? ORDER BY rowid",
+                self.conn,
+                params=(run_started or self.run_started,),
+            )
+
+    def write_diff(self, dir_path):
+        """
+        현재 실행의 변화를 dir_path/<실행 시작 시각>.csv 로 저장 -> 저장 경로 (변화가 없으면 None)
+        """
+        diff = self.diff()
+        counts = diff['event'].value_counts()
+        print(f"[PLACE DIFF] 신규 {counts.get('opened', 0)} / 폐점 {counts.get('closed', 0)} / "
+              f"이전 {counts.get('moved', 0)}")
+        if len(diff) == 0:
+            return None
+        os.makedirs(dir_path, exist_ok=True)
+        file_name = datetime.fromtimestamp(self.run_started).strftime('%Y%m%d_%H%M%S') + '.csv'
+        save_path = os.path.join(dir_path, file_name)
+        diff.to_csv(save_path, index=False, encoding="utf-8-sig")
+        return save_path
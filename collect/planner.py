@@ -0,0 +1,226 @@
+"""
+수집 계획 / 할당량 추정 (API 호출 없음).
+지난 수집 기록(region_history 의 브랜드/구/동 total_count, metrics json 의 브랜드별 호출 수)으로
+_search_plan 의 flat / 시도 / 구 / 동 검색 규칙을 그대로 따라 브랜드별 API 호출 수를 추정하고,
+전체 키의 오늘 남은 할당량과 비교해 미룰 브랜드를 제안한다.
+
+python -m collect.planner
+python -m collect.planner --all --out ./save_data/plan.csv
+"""
+import argparse
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from collect.kakao_api import KakaoAPIManager
+from collect.priority import BrandPriority
+
+
+def _pages(count, max_pages=3):
+    """
+    total_count 가 count 인 검색어를 1페이지부터 수집할 때의 호출 수 (페이지당 15건, 15건 미만이면 중단)
+    """
+    if count is None:
+        return 1
+    return min(max_pages, count // 15 + 1)
+
+
+def estimate_brand_calls(manager, store_name, history):
+    """
+    브랜드 하나의 예상 API 호출 수 -> (호출 수, 검색 방식) / 기록이 없으면 (None, 'unknown')
+    history: 해당 브랜드의 {검색어: (total_count, 확인 날짜)} (RegionHistory.load)
+    고유 id 수가 total_count 에 도달해 남은 지역을 생략하는 경우(coverage_tolerance)는 반영하지 않으므로 상한값.
+    """
+    if store_name not in history:
+        return None, 'unknown'
+    total_count = history[store_name][0]
+    if total_count <= 15:
+        return 1, 'flat'
+    if total_count <= 45:
+        return _pages(total_count), 'flat'
+    if manager.search_mode == 'quadtree':
+        return None, 'quadtree'
+
+    calls = 1
+    gu_values = list(manager.guso_index.values())
+    if manager.sido_tier:
+        # _sido_plan: 0건 시도는 건너뜀, 45건 이하 시도는 시도 검색(+페이지), 초과 시도 / 구가 하나인 시도는 구 검색으로
+        gu_values = []
+        for sido, gus in manager.sido_index.items():
+            sido_query = f"{store_name} {sido}"
+            sido_count = history.get(sido_query, (None,))[0]
+            if len(gus) > 1 and manager._should_probe(history, sido_query) and (sido_count or 0) <= 45:
+                calls += _pages(sido_count)
+                if sido_count is not None and sido_count <= 45:
+                    continue
+            elif len(gus) > 1 and (sido_count or 0) <= 45:
+                continue
+            gu_values.extend(gus)
+
+    # _search_plan 의 구/동 검색: 45건 이하였던 구는 구 검색(+페이지), 초과였던 구는 동 검색, 0건 지역은 재확인 주기마다
+    for value in gu_values:
+        gu_query = f"{store_name} {value['gu']}"
+        gu_count = history.get(gu_query, (0,))[0]
+        if manager._should_probe(history, gu_query) and gu_count <= 45:
+            # 구 첫 페이지 + 2페이지부터 이어서 검색 (2페이지는 항상, 3페이지는 2페이지가 가득 찬 경우)
+            calls += 1 + max(_pages(history.get(gu_query, (None,))[0]) - 1, 1)
+            continue
+        if gu_count <= 45:
+            continue
+        for dong_keyword in value['dong']:
+            dong_query = f"{store_name} {dong_keyword}"
+            if manager._should_probe(history, dong_query):
+                calls += _pages(history.get(dong_query, (None,))[0])
+    return calls, 'region'
+
+
+def region_upper_bound(manager):
+    """
+    기록이 없는 브랜드의 호출 수 상한 (region 검색): flat 1 + 모든 시도 / 구 / 동을 3페이지까지 검색하는 경우.
+    45건 이하 지역은 최대 3페이지, 45건 초과 지역은 첫 페이지 + 하위 지역 전체 중 큰 쪽.
+    """
+    def gu_calls(value):
+        return max(3, 1 + 3 * len(value['dong']))
+
+    if not manager.sido_tier:
+        return 1 + sum(gu_calls(value) for value in manager.guso_index.values())
+    calls = 1
+    for gus in manager.sido_index.values():
+        sweep = sum(gu_calls(value) for value in gus)
+        calls += sweep if len(gus) == 1 else max(3, 1 + sweep)
+    return calls
+
+
+def _metrics_calls(metrics_path):
+    """
+    지난 실행 metrics json 의 브랜드별 실제 API 호출 수 / 초당 요청 수
+    """
+    if not metrics_path or not os.path.exists(metrics_path):
+        return {}, None
+    with open(metrics_path, encoding='utf-8') as f:
+        snapshot = json.load(f)
+    calls = {brand: sum(count for key, count in stats.get('calls', {}).items() if key.endswith('.api'))
+             for brand, stats in snapshot.get('brands', {}).items()}
+    rate = snapshot['api_calls'] / snapshot['uptime_sec'] if snapshot.get('uptime_sec') else None
+    return calls, rate
+
+
+def plan_run(manager, tasks, metrics_path=None, reserve=0.1):
+    """
+    tasks: [(target_index, 검색어), ...] -> (브랜드별 계획 DataFrame, 요약 dict)
+    브랜드별 추정 순서: region_history 기반 추정 -> 지난 metrics 의 실제 호출 수 ->
+    기록이 전혀 없는 브랜드는 지역 인덱스 기준 상한(region_upper_bound, source='unknown'),
+    quadtree 처럼 상한을 정할 수 없는 경우만 추정된 브랜드 평균(source='fallback').
+    추정값(estimated_calls)과 기록 없는 브랜드의 상한(unknown_calls_upper)은 요약에서 따로 보고.
+    남은 할당량(reserve 비율 제외)을 넘는 부분은 우선순위(collect.priority) 낮은 브랜드부터 deferred (상한 포함).
+    """
+    history = manager.region_history.load_all() if manager.region_history is not None else {}
+    observed_calls, observed_rate = _metrics_calls(metrics_path)
+
+    upper_bound = region_upper_bound(manager) if manager.search_mode == 'region' else None
+    rows = []
+    for target_index, store_name in tasks:
+        calls, strategy = estimate_brand_calls(manager, store_name, history.get(store_name, {}))
+        source = 'history'
+        if calls is None and observed_calls.get(store_name):
+            calls, source = observed_calls[store_name], 'metrics'
+        elif calls is None and strategy == 'unknown' and upper_bound is not None:
+            calls, source = upper_bound, 'unknown'
+        elif calls is None:
+            source = 'fallback'
+        total_count = history.get(store_name, {}).get(store_name, (None,))[0]
+        rows.append((store_name, target_index, total_count, strategy, source, np.nan if calls is None else calls))
+    plan = pd.DataFrame(rows, columns=['query', 'target_index', 'total_count', 'strategy', 'source', 'calls']) \
+        .set_index('query')
+    known = plan.loc[plan['source'].isin(['history', 'metrics']), 'calls']
+    fallback = float(known.mean()) if len(known) else 1.0
+    plan['calls'] = plan['calls'].fillna(fallback).round().astype(int)
+
+    # 우선순위 순으로 누적 호출 수를 계산해 남은 할당량을 넘는 브랜드는 미룸
+    priority = BrandPriority(manager.target_df)
+    ranked = priority.rank(*manager._crawl_state(priority.change_days))
+    plan = plan.loc[[query for query in ranked.index if query in plan.index]]
+    key_stats = manager.key_pool.stats()
+    budget = int(key_stats['remaining_quota'] * (1 - reserve))
+    plan['cumulative_calls'] = plan['calls'].cumsum()
+    plan['deferred'] = plan['cumulative_calls'] > budget
+
+    rate_cap = manager.key_pool.rate_per_sec * len(manager.api_keys) if manager.key_pool.rate_per_sec else None
+    rate = observed_rate or rate_cap
+    unknown = plan['source'] == 'unknown'
+    total_calls = int(plan.loc[~unknown, 'calls'].sum())
+    upper_calls = int(plan.loc[unknown, 'calls'].sum())
+    summary = {
+        'brands': len(plan),
+        'estimated_calls': total_calls,
+        'unknown_brands': int(unknown.sum()),
+        'unknown_calls_upper': upper_calls,
+        'unknown_calls_per_brand_upper': upper_bound,
+        'fallback_brands': int((plan['source'] == 'fallback').sum()),
+        'fallback_calls_per_brand': round(fallback, 1),
+        'daily_quota': manager.key_pool.daily_quota * len(manager.api_keys),
+        'remaining_quota': key_stats['remaining_quota'],
+        'budget': budget,
+        # fits: 추정된 브랜드만, fits_upper: 기록 없는 브랜드를 상한으로 더한 경우
+        'fits': total_calls <= budget,
+        'fits_upper': total_calls + upper_calls <= budget,
+        'deferred_brands': int(plan['deferred'].sum()),
+        'deferred_calls': int(plan.loc[plan['deferred'], 'calls'].sum()),
+        'request_rate': rate,
+        'rate_source': 'metrics' if observed_rate else 'key_rate_per_sec',
+        'estimated_hours': total_calls / rate / 3600 if rate else None,
+        'upper_hours': (total_calls + upper_calls) / rate / 3600 if rate else None,
+        'keys_needed': int(np.ceil(total_calls / manager.key_pool.daily_quota)),
+        'keys_needed_upper': int(np.ceil((total_calls + upper_calls) / manager.key_pool.daily_quota)),
+    }
+    return plan, summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description='수집 계획 / 할당량 추정 (API 호출 없음)')
+    parser.add_argument('--metrics', default='./cache/metrics.json', help='지난 실행 metrics json (관측 요청 속도 / 브랜드별 호출 수)')
+    parser.add_argument('--all', action='store_true', help='이미 저장된 브랜드 포함 전체 브랜드 기준 (recrawl)')
+    parser.add_argument('--reserve', type=float, default=0.1, help='남겨 둘 할당량 비율')
+    parser.add_argument('--out', default=None, help='브랜드별 계획 csv 저장 경로')
+    args = parser.parse_args()
+
+    kakao_api = KakaoAPIManager(
+        progress_file_path='./save_data/',
+        key_usage_path='./cache/key_usage.json',
+        recrawl=args.all,
+        region_history_path='./cache/region_history.sqlite',
+        storage='sqlite',
+    )
+    plan, summary = plan_run(kakao_api, kakao_api._pending_tasks(), metrics_path=args.metrics, reserve=args.reserve)
+
+    print(f"[PLAN] 대상 브랜드 {summary['brands']}개, 기록으로 추정한 {summary['brands'] - summary['unknown_brands']}개 "
+          f"예상 API 호출 {summary['estimated_calls']}건"
+          + (f" (그중 {summary['fallback_brands']}개는 브랜드당 평균 {summary['fallback_calls_per_brand']}건)"
+             if summary['fallback_brands'] else ''))
+    if summary['unknown_brands']:
+        print(f"[PLAN] 기록 없는 브랜드 {summary['unknown_brands']}개: 상한 {summary['unknown_calls_upper']}건 "
+              f"(브랜드당 최대 {summary['unknown_calls_per_brand_upper']}건, 45건 이하 브랜드는 1~3건)")
+    print(f"[PLAN] 전체 일일 할당량 {summary['daily_quota']}건, 오늘 남은 할당량 {summary['remaining_quota']}건 "
+          f"(여유분 제외 {summary['budget']}건) -> 추정분 {'가능' if summary['fits'] else '초과'}"
+          + (f", 상한 포함 {'가능' if summary['fits_upper'] else '초과'}" if summary['unknown_brands'] else ''))
+    if summary['estimated_hours'] is not None:
+        print(f"[PLAN] 예상 소요 {summary['estimated_hours']:.1f}시간"
+              + (f" (상한 포함 {summary['upper_hours']:.1f}시간)" if summary['unknown_brands'] else '')
+              + f", 초당 {summary['request_rate']:.1f}건 {summary['rate_source']} 기준")
+    print(f"[PLAN] 하루에 모두 수집하려면 키 {summary['keys_needed']}개 필요"
+          + (f" (상한 포함 {summary['keys_needed_upper']}개)" if summary['unknown_brands'] else '')
+          + f", 현재 {len(kakao_api.api_keys)}개")
+    by_strategy = plan.groupby('strategy')['calls'].agg(['count', 'sum'])
+    print(f"[PLAN] 검색 방식별 브랜드 수 / 호출 수\n{by_strategy}")
+    if summary['deferred_brands']:
+        print(f"[PLAN] 우선순위가 낮은 {summary['deferred_brands']}개 브랜드({summary['deferred_calls']}건)는 다음 할당량으로 미루기 권장")
+        print(plan[plan['deferred']].sort_values('calls', ascending=False).head(20)[['total_count', 'strategy', 'calls']])
+    if args.out:
+        plan.to_csv(args.out, encoding="utf-8-sig")
+        print(f"[PLAN] {args.out} 저장")
+
+
+if __name__ == '__main__':
+    main()
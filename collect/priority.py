@@ -0,0 +1,80 @@
+import time
+
+import numpy as np
+import pandas as pd
+
+from collect.normalize import build_query_table
+
+DAY = 24 * 3600
+
+# tier 별 목표 갱신 주기(초) -> 마지막 수집 후 이 시간이 지나면 수집 대상(due)
+#   new     : 최초등록일이 최근 new_days 이내인 신규 가맹 브랜드
+#   changed : 최근 change_days 동안 신규/폐점/이전 매장이 있었던 브랜드
+#   normal  : 그 외
+#   empty   : 지난 수집 결과가 0건인 브랜드
+DEFAULT_TIERS = {
+    'new': 1 * DAY,
+    'changed': 1 * DAY,
+    'normal': 3 * DAY,
+    'empty': 14 * DAY,
+}
+
+
+class BrandPriority:
+    """
+    브랜드(검색어)별 수집 우선순위.
+    - tier(new / changed / normal / empty)마다 목표 갱신 주기(tiers)를 두고, 경과 시간 / 목표 주기 가 클수록 먼저 수집
+    - 최근 변화가 많은 브랜드일수록 목표 주기를 짧게
+    - upjong_weights: 업종별 가중치 (예: {'커피': 2.0} -> 커피 브랜드는 두 배 자주 갱신), 없는 업종은 1.0
+    - 한 번도 수집하지 않은 브랜드가 가장 먼저, 같은 점수면 최초등록일이 최근인 브랜드부터
+    신규 여부는 가맹점 목록(data.tsv)에서 가장 최근 최초등록일 기준 new_days 이내.
+    """
+
+    def __init__(self, target_df, tiers=None, upjong_weights=None, new_days=365, change_days=14):
+        self.tiers = {**DEFAULT_TIERS, **(tiers or {})}
+        self.change_days = change_days
+
+        table = build_query_table(target_df)
+        registered = pd.to_datetime(target_df['최초등록일'], format='%Y.%m.%d', errors='coerce')
+        # 같은 검색어로 묶인 영업표지 중 가장 최근 등록일 / 첫 행의 업종
+        rows = table['target_rows'].explode()
+        self.registered = registered.loc[rows.values].groupby(rows.index.values, sort=False).max().reindex(table.index)
+        upjong = target_df['업종'].loc[table['target_index']].values
+        weights = upjong_weights or {}
+        self.weight = pd.Series([weights.get(name, 1.0) for name in upjong], index=table.index, dtype=float)
+        self.is_new = (self.registered >= registered.max() - pd.Timedelta(days=new_days)).values
+        self.table = table
+
+    def rank(self, last_crawled, last_rows=None, changes=None, now=None):
+        """
+        last_crawled: {검색어: 마지막 수집 시각(epoch)}, last_rows: {검색어: 마지막 수집 행 수},
+        changes: {검색어: 최근 change_days 동안 변화(신규/폐점/이전) 수}
+        -> 우선순위 순으로 정렬한 DataFrame (index: 검색어, target_index, tier, staleness, target, due_in, score)
+        due_in <= 0 인 브랜드가 수집 대상.
+        """
+        now = time.time() if now is None else now
+        index = self.table.index
+        crawled = pd.Series(last_crawled, dtype=float).reindex(index).values
+        rows = pd.Series(last_rows or {}, dtype=float).reindex(index).values
+        changed = pd.Series(changes or {}, dtype=float).reindex(index).fillna(0).values
+
+        tier = np.select(
+            [self.is_new, changed > 0, rows == 0],
+            ['new', 'changed', 'empty'],
+            default='normal',
+        )
+        # 변화가 많을수록 목표 주기를 줄임 (변화 1건: 1/1.7, 10건: 1/3.4)
+        target = pd.Series(tier).map(self.tiers).values / self.weight.values / (1 + np.log1p(changed))
+        never = np.isnan(crawled)
+        staleness = np.where(never, np.inf, now - np.nan_to_num(crawled))
+
+        ranked = pd.DataFrame({
+            'target_index': self.table['target_index'].values,
+            'tier': tier,
+            'staleness': staleness,
+            'target': target,
+            'due_in': np.where(never, -np.inf, target - staleness),
+            'score': staleness / target,
+            'registered': self.registered.values,
+        }, index=index)
+        return ranked.sort_values(['score', 'registered'], ascending=[False, False], na_position='last')
@@ -0,0 +1,64 @@
+import os
+import sqlite3
+import threading
+from datetime import date
+
+
+class RegionHistory:
+    """
+    브랜드별 지역 검색어의 직전 total_count 기록 (SQLite).
+    다음 수집 때 지난번 결과가 있던 지역만 다시 검색하고, 0건이던 지역은 empty_recheck_days 마다만 재확인하는 데 사용.
+    """
+
+    def __init__(self, path='./cache/region_history.sqlite'):
+        dir_name = os.path.dirname(path)
+        if dir_name:
+            os.makedirs(dir_name, exist_ok=True)
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False, timeout=60)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS region_count (
+                brand TEXT NOT NULL,
+                query TEXT NOT NULL,
+                total_count INTEGER NOT NULL,
+                checked_day TEXT NOT NULL,
+                PRIMARY KEY (brand, query)
+            )
+            """
+        )
+        self.conn.commit()
+
+    def load(self, brand):
+        """
+        {검색어: (total_count, 확인 날짜(date))}
+        """
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT query, total_count, checked_day FROM region_count WHERE brand = ?", (brand,)
+            ).fetchall()
+        return {query: (count, date.fromisoformat(day)) for query, count, day in rows}
+
+    def load_all(self):
+        """
+        {브랜드: {검색어: (total_count, 확인 날짜(date))}} (수집 계획 추정용)
+        """
+        with self.lock:
+            rows = self.conn.execute("SELECT brand, query, total_count, checked_day FROM region_count").fetchall()
+        history = {}
+        for brand, query, count, day in rows:
+            history.setdefault(brand, {})[query] = (count, date.fromisoformat(day))
+        return history
+
+    def update(self, brand, observed, day=None):
+        """
+        observed: {검색어: total_count} -> 이번에 확인한 지역만 갱신 (확인하지 않은 지역은 이전 기록 유지)
+        """
+        day = (day or date.today()).isoformat()
+        with self.lock:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO region_count (brand, query, total_count, checked_day) VALUES (?, ?, ?, ?)",
+                [(brand, query, count, day) for query, count in observed.items()],
+            )
+            self.conn.commit()
@@ -0,0 +1,78 @@
+import hashlib
+import os
+import pickle
+
+import pandas as pd
+
+# 저장 구조가 바뀌면 올려서 기존 캐시를 무시
+INDEX_VERSION = 2
+
+
+def build_region_index(guso):
+    """
+    시군구동 DataFrame(SIDO_NM, SIGUNGU_NM, GU_NM, DONG_NM) -> 지역 인덱스
+    - 'gu': {구 key: {'only_gu', 'gu': 구 검색어, 'dong': [동 검색어, ...]}} (기존 guso_index 와 동일)
+    - 'sido': {시도: {구 key: [동, ...]}}
+    - 'sido_gu': {시도: [{'only_gu', 'gu', 'dong'}, ...]} (시도별 구 목록, 여러 시도에 같은 이름의 구가 있어도 시도마다 따로)
+    """
+    has_gu = guso['GU_NM'].map(lambda v: type(v) == str)
+    gu_keys = guso['SIGUNGU_NM'].where(~has_gu, ' ' + guso['GU_NM'].astype(str))
+    gu_queries = guso['SIDO_NM'] + ' ' + gu_keys
+    dong_queries = gu_queries + ' ' + guso['DONG_NM']
+
+    gu_index = {}
+    sido_index = {}
+    for sido, gu, dong, gu_query, dong_query in zip(
+        guso['SIDO_NM'], gu_keys, guso['DONG_NM'], gu_queries, dong_queries
+    ):
+        if gu in gu_index:
+            gu_index[gu]['dong'].append(dong_query)
+        else:
+            gu_index[gu] = {'only_gu': gu, 'gu': gu_query, 'dong': [dong_query]}
+        sido_index.setdefault(sido, {}).setdefault(gu, []).append(dong)
+
+    sido_gu_index = {
+        sido: [{'only_gu': gu, 'gu': f"{sido} {gu}", 'dong': [f"{sido} {gu} {dong}" for dong in dongs]}
+               for gu, dongs in gus.items()]
+        for sido, gus in sido_index.items()
+    }
+    return {'gu': gu_index, 'sido': sido_index, 'sido_gu': sido_gu_index}
+
+
+def _file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def load_region_index(guso_path, cache_path=None):
+    """
+    지역 인덱스 로드. xlsx 옆의 캐시(guso_path + '.index.pkl')가 같은 원본 hash 로 만들어졌으면 바로 사용하고,
+    xlsx 가 바뀌었거나 캐시가 없으면 다시 만들어 저장.
+    """
+    cache_path = cache_path or guso_path + '.index.pkl'
+    source_hash = _file_hash(guso_path)
+
+    if os.path.exists(cache_path):
+        try:
+            with open(cache_path, 'rb') as f:
+                cached = pickle.load(f)
+            if cached.get('version') == INDEX_VERSION and cached.get('source_hash') == source_hash:
+                return cached['index']
+        except Exception as e:
+            print(f"[REGION INDEX] 캐시 읽기 실패, 다시 생성: {e}")
+
+    index = build_region_index(pd.read_excel(guso_path))
+    try:
+        tmp_path = cache_path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            pickle.dump({'version': INDEX_VERSION, 'source_hash': source_hash, 'index': index}, f,
+                        protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+        print(f"[REGION INDEX] {cache_path} 생성 (구 {len(index['gu'])}개)")
+    except OSError as e:
+        # 읽기 전용 위치 등 -> 캐시 없이 진행
+        print(f"[REGION INDEX] 캐시 저장 실패: {e}")
+    return index
@@ -0,0 +1,90 @@
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+from collect.normalize import _NOT_ALLOWED
+
+# 이 점수 미만인 검색 결과는 브랜드 매장이 아닌 것으로 판단
+DEFAULT_THRESHOLD = 0.8
+
+
+def _compact(values):
+    """
+    비교용 문자열: 한글, 숫자, 영어만 남기고 공백 제거 + 소문자 (Series 단위)
+    """
+    return values.fillna('').astype(str).str.replace(_NOT_ALLOWED, '', regex=True) \
+        .str.replace(r'\s+', '', regex=True).str.lower()
+
+
+def relevance_scores(data, brand, patterns=None):
+    """
+    검색 결과(DataFrame, place_name / category_name) 의 브랜드 일치 점수 (0~1, numpy 배열).
+    - place_name 또는 category_name(카카오 분류 마지막 단계에 프랜차이즈명이 들어감)에 브랜드명이 통째로 있으면 1
+    - 아니면 브랜드명 2글자 조각(bigram) 중 place_name 에 들어 있는 비율 (띄어쓰기 / 일부 표기 차이 허용)
+    - patterns: 알려진 지점명 정규식 목록 (예: 영문 브랜드의 한글 표기), 하나라도 맞으면 1
+    행마다 반복하지 않고 브랜드 bigram 수만큼의 문자열 연산으로 전체 행을 한 번에 계산.
+    """
+    if len(data) == 0:
+        return np.zeros(0)
+    key = _compact(pd.Series([brand])).iloc[0]
+    names = _compact(data['place_name'])
+    categories = _compact(data['category_name'])
+    if not key:
+        return np.ones(len(data))
+
+    exact = names.str.contains(key, regex=False) | categories.str.contains(key, regex=False)
+    bigrams = {key[i:i + 2] for i in range(len(key) - 1)}
+    if bigrams:
+        hits = sum(names.str.contains(bigram, regex=False).to_numpy(dtype=int) for bigram in bigrams)
+        partial = hits / len(bigrams)
+    else:
+        partial = np.zeros(len(data))
+    scores = np.where(exact.to_numpy(), 1.0, partial)
+
+    if patterns:
+        pattern = '|'.join(f"(?:{p})" for p in patterns)
+        matched = data['place_name'].fillna('').astype(str).str.contains(pattern, regex=True, flags=re.IGNORECASE)
+        scores = np.where(matched.to_numpy(), 1.0, scores)
+    return scores
+
+
+class RelevanceFilter:
+    """
+    브랜드 검색 결과에서 브랜드 매장이 아닌 행(이웃 가게, 비슷한 이름, 지역명만 일치)을 저장 전에 걸러냄.
+    - mode='drop': 점수 threshold 미만 행을 버림
+    - mode='flag': 행은 그대로 저장하고, threshold 미만 행만 review_dir/<브랜드>.csv 에 점수와 함께 기록
+    patterns: {브랜드(검색어): [지점명 정규식, ...]}
+    """
+
+    def __init__(self, threshold=DEFAULT_THRESHOLD, mode='drop', patterns=None, review_dir=None):
+        if mode not in ('drop', 'flag'):
+            raise ValueError(f"mode 는 'drop' 또는 'flag': {mode}")
+        self.threshold = threshold
+        self.mode = mode
+        self.patterns = patterns or {}
+        self.review_dir = review_dir
+
+    def __call__(self, brand, data):
+        """
+        DataFrame(PLACE_COLUMNS) -> (저장할 DataFrame, threshold 미만 행 수)
+        """
+        if len(data) == 0:
+            return data, 0
+        scores = relevance_scores(data, brand, self.patterns.get(brand))
+        low = scores < self.threshold
+        n_low = int(low.sum())
+        if n_low == 0:
+            return data, 0
+        if self.mode == 'drop':
+            return data[~low].reset_index(drop=True), n_low
+        self._review(brand, data[low].assign(relevance=scores[low]))
+        return data, n_low
+
+    def _review(self, brand, rows):
+        if not self.review_dir:
+            return
+        os.makedirs(self.review_dir, exist_ok=True)
+        review_path = os.path.join(self.review_dir, brand + '.csv')
+        rows.to_csv(review_path, mode='a', header=not os.path.exists(review_path), index=False, encoding="utf-8-sig")
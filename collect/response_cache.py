@@ -0,0 +1,118 @@
+import os
+import sqlite3
+import threading
+import time
+
+
+class ResponseCache:
+    """
+    get_places 응답(JSON 원문)을 (검색어, page) 키로 저장하는 SQLite 파일 캐시.
+    - ttl: 항목별 유효 시간(초). 지난 항목은 조회 시 miss 로 처리하고 삭제
+    - max_bytes: 저장된 응답 크기 합이 넘으면 가장 오래 사용하지 않은 항목부터 삭제
+    하루 안에 재실행하거나 중단 후 재시작할 때 같은 검색어로 API 할당량을 다시 쓰지 않기 위해 사용.
+    """
+
+    def __init__(self, path='./cache/kakao_response.sqlite', ttl=3600 * 20, max_bytes=512 * 1024 * 1024):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evicted = 0
+
+        dir_name = os.path.dirname(path)
+        if dir_name:
+            os.makedirs(dir_name, exist_ok=True)
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False, timeout=60)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS response (
+                query TEXT NOT NULL,
+                page INTEGER NOT NULL,
+                body TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                PRIMARY KEY (query, page)
+            )
+            """
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_response_accessed ON response (accessed_at)")
+        with self.lock:
+            self.conn.execute("DELETE FROM response WHERE created_at < ?", (time.time() - self.ttl,))
+            self.conn.commit()
+            self.total_bytes = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM response").fetchone()[0]
+
+    def get(self, query, page):
+        """
+        캐시된 JSON 원문 반환. 없거나 만료된 경우 None
+        """
+        now = time.time()
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT body, size, created_at FROM response WHERE query = ? AND page = ?", (query, page)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            body, size, created_at = row
+            if now - created_at > self.ttl:
+                self.conn.execute("DELETE FROM response WHERE query = ? AND page = ?", (query, page))
+                self.conn.commit()
+                self.total_bytes -= size
+                self.misses += 1
+                return None
+            self.conn.execute("UPDATE response SET accessed_at = ? WHERE query = ? AND page = ?", (now, query, page))
+            self.conn.commit()
+            self.hits += 1
+            return body
+
+    def put(self, query, page, body):
+        now = time.time()
+        size = len(body.encode('utf-8'))
+        with self.lock:
+            old = self.conn.execute("SELECT size FROM response WHERE query = ? AND page = ?", (query, page)).fetchone()
+            self.conn.execute(
+                "INSERT OR REPLACE INTO response (query, page, body, size, created_at, accessed_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (query, page, body, size, now, now),
+            )
+            self.total_bytes += size - (old[0] if old else 0)
+            if self.total_bytes > self.max_bytes:
+                self._evict()
+            self.conn.commit()
+
+    def _evict(self):
+        """
+        최근 사용 시각이 오래된 항목부터 max_bytes 의 90% 이하가 될 때까지 삭제. self.lock 을 잡은 상태에서 호출.
+        """
+        target = self.max_bytes * 0.9
+        while self.total_bytes > target:
+            rows = self.conn.execute(
+                "SELECT query, page, size FROM response ORDER BY accessed_at LIMIT 500"
+            ).fetchall()
+            if not rows:
+                self.total_bytes = 0
+                break
+            for query, page, size in rows:
+                self.conn.execute("DELETE FROM response WHERE query = ? AND page = ?", (query, page))
+                self.total_bytes -= size
+                self.evicted += 1
+                if self.total_bytes <= target:
+                    break
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / total, 4) if total else 0.0,
+            'evicted': self.evicted,
+            'bytes': self.total_bytes,
+        }
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
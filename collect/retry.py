@@ -0,0 +1,97 @@
+import random
+import threading
+from collections import deque
+
+import numpy as np
+
+
+class RetryPolicy:
+    """
+    API 요청 재시도 / hedging 정책 (스레드 안전).
+    - connect_timeout / read_timeout: 연결, 응답 대기 제한(초) -> 멈춘 연결이 워커를 붙잡지 않음
+    - 5xx / 네트워크 오류는 지수 backoff + full jitter 로 요청당 최대 max_retries 번 재시도
+    - retry_budget: 실행 전체의 재시도 총량 (장애 시 재시도가 폭주해 할당량/시간을 다 쓰는 것 방지, None 이면 무제한)
+    - hedge_percentile: 지정 시 최근 성공 요청 지연의 해당 백분위(예: 95)를 넘긴 요청은 다른 키로 한 번 더 보내고
+      먼저 온 응답을 사용 (지연 표본이 hedge_min_samples 개 이상 쌓인 뒤부터)
+    """
+
+    def __init__(
+        self,
+        connect_timeout=3.05,
+        read_timeout=10.0,
+        max_retries=4,
+        base_delay=0.5,
+        max_delay=30.0,
+        retry_budget=1000,
+        hedge_percentile=None,
+        hedge_min_samples=100,
+        window=1000,
+    ):
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retry_budget = retry_budget
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_samples = hedge_min_samples
+
+        self.lock = threading.Lock()
+        self.retries = 0
+        self.latencies = deque(maxlen=window)
+        self.observed = 0
+        self._hedge_delay = None
+
+    @property
+    def timeout(self):
+        """
+        requests 용 (connect, read) timeout
+        """
+        return (self.connect_timeout, self.read_timeout)
+
+    def next_delay(self, attempt):
+        """
+        attempt 번째(0부터) 재시도 전 대기 시간. 재시도하지 않아야 하면 None
+        (요청당 최대 횟수 초과 또는 실행 전체 재시도 예산 소진)
+        """
+        if attempt >= self.max_retries:
+            return None
+        with self.lock:
+            if self.retry_budget is not None and self.retries >= self.retry_budget:
+                return None
+            self.retries += 1
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    def reset_budget(self):
+        """
+        재시도 예산 초기화 (상시 실행에서 배치마다 호출)
+        """
+        with self.lock:
+            self.retries = 0
+
+    def observe(self, seconds):
+        """
+        성공한 요청의 지연 기록 (hedging 기준 계산용)
+        """
+        if self.hedge_percentile is None:
+            return
+        with self.lock:
+            self.latencies.append(seconds)
+            self.observed += 1
+            # 매번 정렬하지 않도록 50건마다 기준 갱신
+            if len(self.latencies) >= self.hedge_min_samples and self.observed % 50 == 0:
+                self._hedge_delay = float(np.percentile(self.latencies, self.hedge_percentile))
+
+    def hedge_delay(self):
+        """
+        이 시간(초) 안에 응답이 없으면 중복 요청. hedging 을 하지 않으면 None
+        """
+        return self._hedge_delay
+
+    def stats(self):
+        with self.lock:
+            return {
+                'retries': self.retries,
+                'retry_budget': self.retry_budget,
+                'hedge_delay': self._hedge_delay,
+            }
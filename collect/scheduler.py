@@ -0,0 +1,176 @@
+import itertools
+import queue
+import threading
+
+from tqdm import tqdm
+
+
+class _BrandState:
+    """
+    수집 중인 브랜드 하나의 진행 상태.
+    plan: KakaoAPIManager._search_plan generator / stream: 브랜드 결과 파이프라인(DocumentStream)
+    responses: 현재 단계 요청들의 응답 슬롯
+    """
+
+    def __init__(self, seq, target_index, store_name, stream, plan):
+        self.seq = seq
+        self.target_index = target_index
+        self.store_name = store_name
+        self.stream = stream
+        self.plan = plan
+        self.batch = []
+        self.responses = []
+        self.remaining = 0
+        self.error = None
+        self.lock = threading.Lock()
+
+
+class RegionTaskScheduler:
+    """
+    (브랜드, 지역, 페이지) 단위 요청을 하나의 전역 작업 큐로 처리하는 스케줄러.
+    브랜드 하나가 워커 하나를 독점하지 않고, 모든 워커가 어떤 브랜드의 지역 요청이든 가져가서 처리.
+    한 브랜드의 현재 단계 요청이 모두 끝나면 다음 단계(구 -> 동 / 다음 페이지) 요청을 큐에 넣고,
+    계획이 끝나면 브랜드 완료 처리(남은 결과 저장)를 한다.
+
+    먼저 시작한 브랜드의 요청을 우선 처리(PriorityQueue)해서 브랜드가 순서대로 마무리되도록 하고,
+    동시에 진행하는 브랜드 수는 max_brands 로 제한한다.
+    """
+
+    def __init__(self, manager, max_workers=10, max_brands=None):
+        self.manager = manager
+        self.max_workers = max_workers
+        self.max_brands = max_brands or max_workers * 4
+
+        self.queue = queue.PriorityQueue()
+        self.counter = itertools.count()
+        # 브랜드 종료(_finish) -> 다음 브랜드 시작(_admit_next) 이 재귀적으로 일어날 수 있어 RLock
+        self.lock = threading.RLock()
+        self.stop_event = threading.Event()
+        self.all_done = threading.Event()
+
+        self.pending = []
+        self.active = 0
+        self.pbar = None
+        self.total_target_count = 0
+
+    def run(self, tasks, total_target_count):
+        """
+        tasks: [(target_index, store_name), ...]
+        """
+        self.pending = [(seq, idx, store_name) for seq, (idx, store_name) in enumerate(tasks)]
+        self.pending.reverse()
+        self.total_target_count = total_target_count
+        if not self.pending:
+            return
+
+        metrics = self.manager.metrics
+        metrics.set_gauge('queue_depth', self.queue_depth)
+        metrics.set_gauge('active_brands', lambda: self.active)
+        with tqdm(total=len(tasks), desc="전체 진행 상황") as pbar:
+            self.pbar = pbar
+            workers = [threading.Thread(target=self._worker, daemon=True) for _ in range(self.max_workers)]
+            for worker in workers:
+                worker.start()
+
+            with self.lock:
+                for _ in range(self.max_brands):
+                    self._admit_next()
+
+            self.all_done.wait()
+            self.stop_event.set()
+            for worker in workers:
+                worker.join()
+        metrics.set_gauge('queue_depth', None)
+        metrics.set_gauge('active_brands', None)
+
+    def queue_depth(self):
+        return self.queue.qsize()
+
+    def _admit_next(self):
+        """
+        대기 중인 브랜드 하나를 시작. self.lock 을 잡은 상태에서 호출.
+        """
+        while self.pending and not self.stop_event.is_set():
+            seq, idx, store_name = self.pending.pop()
+            print(f"[START] {store_name} (index:{idx}/{self.total_target_count}) 수집 시작")
+            stream = self.manager._open_stream(store_name)
+            state = _BrandState(seq, idx, store_name, stream, self.manager._search_plan(store_name, stream.add))
+            self.active += 1
+            if self._advance(state, None):
+                return
+        if self.active == 0:
+            self.all_done.set()
+
+    def _advance(self, state, responses):
+        """
+        브랜드 계획을 한 단계 진행. 새 요청을 큐에 넣었으면 True, 브랜드가 끝났으면 False.
+        """
+        try:
+            batch = next(state.plan) if responses is None else state.plan.send(responses)
+            while not batch:
+                batch = state.plan.send([])
+        except StopIteration:
+            self._finish(state)
+            return False
+        except Exception as e:
+            state.error = e
+            self._finish(state)
+            return False
+
+        state.batch = batch
+        state.responses = [None] * len(batch)
+        state.remaining = len(batch)
+        for slot, request in enumerate(batch):
+            self.queue.put((state.seq, next(self.counter), state, slot, request))
+        return True
+
+    def _worker(self):
+        while not self.stop_event.is_set():
+            try:
+                _, _, state, slot, request = self.queue.get(timeout=0.2)
+            except queue.Empty:
+                continue
+
+            result = None
+            if state.error is None:
+                try:
+                    result = self.manager._fetch(state.store_name, *request)
+                except Exception as e:
+                    state.error = e
+
+            with state.lock:
+                state.responses[slot] = result
+                state.remaining -= 1
+                last = state.remaining == 0
+            if not last:
+                continue
+
+            if state.error is not None:
+                self._finish(state)
+            else:
+                self._advance(state, state.responses)
+
+    def _finish(self, state):
+        """
+        브랜드 계획 종료 -> 남은 결과 저장 후 다음 브랜드 시작
+        """
+        exc = state.error
+        if exc is None:
+            try:
+                self.manager._close_stream(state.stream)
+            except Exception as e:
+                exc = e
+
+        if exc is not None:
+            if len(exc.args) > 0 and exc.args[0] == 987:
+                if not self.stop_event.is_set():
+                    print("[ERROR] 모든 API 키 소진: 나머지 작업을 중단합니다.")
+                self.stop_event.set()
+                self.all_done.set()
+            else:
+                print(f"[ERROR] {state.store_name} (index:{state.target_index}) 수집 실패: {exc}")
+
+        self.pbar.update(1)
+        with self.lock:
+            self.active -= 1
+            self._admit_next()
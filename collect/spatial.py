@@ -0,0 +1,206 @@
+"""
+수집 매장 좌표 격자(grid) 인덱스 + 근접 중복 매장 묶기.
+같은 매장이 여러 브랜드 / 지역 검색에서 다른 id 나 조금 다른 좌표로 나오는 경우를
+거리(radius_m) + 상호명 유사도로 묶는다. 좌표 / 격자 key 는 numpy 배열로만 다뤄 수백만 행도 행 단위 반복 없이 처리.
+
+python -m collect.spatial --db ./save_data/places.sqlite --out ./save_data/near_duplicates.csv
+"""
+import argparse
+import sqlite3
+
+import numpy as np
+import pandas as pd
+
+from collect.relevance import _compact
+
+# 위도 1도 / 경도 1도(적도) 거리(m)
+METERS_PER_DEG_LAT = 110540
+METERS_PER_DEG_LON = 111320
+
+
+class GridIndex:
+    """
+    경위도(x, y) 배열 -> cell_meters 크기 격자 인덱스.
+    점들을 격자 key 순으로 정렬해 두고 searchsorted 로 격자 범위를 찾는다 (KD-tree 대신 numpy 만 사용).
+    cell_meters 이하 반경 검색은 주변 3x3 격자만 확인하면 된다.
+    """
+
+    def __init__(self, x, y, cell_meters=50.0):
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        self.cell_meters = cell_meters
+        # 한국 범위에서는 평균 위도 기준 등장방형 투영으로 충분 (짧은 거리용)
+        self.lat0 = float(np.nanmean(y)) if len(y) else 37.0
+        self.px = x * METERS_PER_DEG_LON * np.cos(np.radians(self.lat0))
+        self.py = y * METERS_PER_DEG_LAT
+        self.valid = ~(np.isnan(self.px) | np.isnan(self.py))
+
+        cx = np.floor(np.where(self.valid, self.px, 0) / cell_meters).astype(np.int64)
+        cy = np.floor(np.where(self.valid, self.py, 0) / cell_meters).astype(np.int64)
+        valid_cy = cy[self.valid]
+        self.cy_min = int(valid_cy.min()) if len(valid_cy) else 0
+        self.cy_span = int(valid_cy.max()) - self.cy_min + 3 if len(valid_cy) else 3
+        keys = self._key(cx, cy)
+        keys[~self.valid] = -1
+        self.cx, self.cy = cx, cy
+        self.order = np.argsort(keys, kind='stable').astype(np.int64)
+        self.sorted_keys = keys[self.order]
+
+    def _key(self, cx, cy):
+        return cx * self.cy_span + (cy - self.cy_min + 1)
+
+    def _cell_ranges(self, cx, cy):
+        keys = self._key(cx, cy)
+        return np.searchsorted(self.sorted_keys, keys, 'left'), np.searchsorted(self.sorted_keys, keys, 'right')
+
+    def radius(self, x, y, radius_m):
+        """
+        (x, y) 에서 radius_m 안의 점 index 배열 (radius_m <= cell_meters)
+        """
+        if radius_m > self.cell_meters:
+            raise ValueError(f"radius_m({radius_m}) 는 cell_meters({self.cell_meters}) 이하")
+        px = x * METERS_PER_DEG_LON * np.cos(np.radians(self.lat0))
+        py = y * METERS_PER_DEG_LAT
+        cx, cy = int(np.floor(px / self.cell_meters)), int(np.floor(py / self.cell_meters))
+        found = []
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                lo, hi = self._cell_ranges(np.int64(cx + dx), np.int64(cy + dy))
+                found.append(self.order[lo:hi])
+        candidates = np.concatenate(found)
+        dist = np.hypot(self.px[candidates] - px, self.py[candidates] - py)
+        return np.sort(candidates[dist <= radius_m])
+
+    def pairs_within(self, radius_m, chunk_size=1_000_000):
+        """
+        거리 radius_m 이내의 모든 점 쌍 (i < j) -> (i 배열, j 배열, 거리 배열)
+        이웃 격자 방향(자기 자신 + 절반 4방향)마다 격자 범위를 searchsorted 로 찾아 후보 쌍을 한 번에 펼친다.
+        chunk_size 개 점씩 나눠 후보 쌍 배열이 너무 커지지 않게 함.
+        """
+        if radius_m > self.cell_meters:
+            raise ValueError(f"radius_m({radius_m}) 는 cell_meters({self.cell_meters}) 이하")
+        points = np.flatnonzero(self.valid)
+        out_i, out_j, out_d = [], [], []
+        for start in range(0, len(points), chunk_size):
+            chunk = points[start:start + chunk_size]
+            for dx, dy in ((0, 0), (1, -1), (1, 0), (1, 1), (0, 1)):
+                lo, hi = self._cell_ranges(self.cx[chunk] + dx, self.cy[chunk] + dy)
+                counts = hi - lo
+                i = np.repeat(chunk, counts)
+                # 각 점의 후보 범위 [lo, hi) 를 이어 붙인 위치
+                offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+                j = self.order[np.repeat(lo, counts) + offsets]
+                if (dx, dy) == (0, 0):
+                    keep = i < j
+                    i, j = i[keep], j[keep]
+                d = np.hypot(self.px[i] - self.px[j], self.py[i] - self.py[j])
+                near = d <= radius_m
+                out_i.append(i[near])
+                out_j.append(j[near])
+                out_d.append(d[near])
+        if not out_i:
+            return np.zeros(0, np.int64), np.zeros(0, np.int64), np.zeros(0)
+        i, j, d = np.concatenate(out_i), np.concatenate(out_j), np.concatenate(out_d)
+        swap = i > j
+        i[swap], j[swap] = j[swap], i[swap]
+        return i, j, d
+
+
+def name_similarity(names, i, j):
+    """
+    상호명 쌍 (i, j) 의 2글자 조각(bigram) Dice 유사도 (0~1).
+    고유 이름마다 bigram 을 정수 id 로 바꿔 두고, 고유 이름 쌍에 대해서만 교집합 크기를 numpy 로 센다.
+    """
+    compact = _compact(pd.Series(names)).to_numpy()
+    codes, uniques = pd.factorize(compact)
+    ci, cj = codes[i], codes[j]
+    scores = np.ones(len(ci))
+    diff = ci != cj
+    if not diff.any():
+        return scores
+
+    # 고유 이름별 bigram (중복 제거) -> (이름 번호, bigram id) 를 이름 번호 순으로 정렬한 배열
+    owner, grams = [], []
+    for code, name in enumerate(uniques):
+        name_grams = {name[k:k + 2] for k in range(len(name) - 1)} or {name}
+        owner.extend([code] * len(name_grams))
+        grams.extend(name_grams)
+    gram_ids, gram_uniques = pd.factorize(pd.Series(grams, dtype=object))
+    n_grams = len(gram_uniques)
+    owner = np.asarray(owner, dtype=np.int64)
+    keys = owner * n_grams + gram_ids
+    order = np.argsort(keys, kind='stable')
+    keys, gram_ids = keys[order], gram_ids[order]
+    sizes = np.bincount(owner, minlength=len(uniques))
+    offsets = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+
+    # 고유 이름 쌍만 계산 (같은 이름 조합이 여러 번 나와도 한 번)
+    lo = np.minimum(ci[diff], cj[diff]).astype(np.int64)
+    hi = np.maximum(ci[diff], cj[diff]).astype(np.int64)
+    pair_keys, inverse = np.unique(lo * len(uniques) + hi, return_inverse=True)
+    pa, pb = pair_keys // len(uniques), pair_keys % len(uniques)
+
+    # a 의 bigram 을 쌍마다 펼쳐 b 의 (이름, bigram) key 에 있는지 확인 -> 쌍별 교집합 크기
+    lengths = sizes[pa]
+    pair_of = np.repeat(np.arange(len(pair_keys)), lengths)
+    starts = np.repeat(offsets[pa] - (np.cumsum(lengths) - lengths), lengths)
+    probe = pb[pair_of] * n_grams + gram_ids[starts + np.arange(len(pair_of))]
+    found = keys[np.minimum(np.searchsorted(keys, probe), len(keys) - 1)] == probe
+    common = np.bincount(pair_of, weights=found, minlength=len(pair_keys))
+
+    scores[diff] = (2 * common / (sizes[pa] + sizes[pb]))[inverse.reshape(-1)]
+    return scores
+
+
+def connected_components(n, i, j):
+    """
+    n 개 점 + 간선 (i, j) -> 점별 묶음 번호 (묶음에서 가장 작은 index). 최소 번호 전파 + pointer jumping.
+    """
+    labels = np.arange(n, dtype=np.int64)
+    if len(i) == 0:
+        return labels
+    while True:
+        low = np.minimum(labels[i], labels[j])
+        before = labels.copy()
+        np.minimum.at(labels, i, low)
+        np.minimum.at(labels, j, low)
+        labels = labels[labels]
+        if np.array_equal(labels, before):
+            return labels
+
+
+def cluster_near_duplicates(data, radius_m=30.0, min_similarity=0.5, cell_meters=None):
+    """
+    DataFrame(x, y, place_name, ...) -> 행별 묶음 번호 배열 (같은 번호 = 같은 매장으로 판단)
+    radius_m 이내이고 상호명 유사도가 min_similarity 이상인 쌍을 같은 매장으로 보고 연결.
+    """
+    x = pd.to_numeric(data['x'], errors='coerce').to_numpy()
+    y = pd.to_numeric(data['y'], errors='coerce').to_numpy()
+    grid = GridIndex(x, y, cell_meters=cell_meters or radius_m)
+    i, j, _ = grid.pairs_within(radius_m)
+    similar = name_similarity(data['place_name'].to_numpy(), i, j) >= min_similarity
+    return connected_components(len(data), i[similar], j[similar])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='전체 브랜드 수집 결과의 근접 중복 매장 묶기')
+    parser.add_argument('--db', default='./save_data/places.sqlite')
+    parser.add_argument('--radius', type=float, default=30.0, help='같은 매장으로 볼 거리(m)')
+    parser.add_argument('--similarity', type=float, default=0.5, help='상호명 유사도 기준 (0~1)')
+    parser.add_argument('--out', default='./save_data/near_duplicates.csv')
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(args.db)
+    data = pd.read_sql_query("SELECT brand, id, place_name, road_address_name, address_name, x, y FROM place", conn)
+    conn.close()
+    data['cluster'] = cluster_near_duplicates(data, radius_m=args.radius, min_similarity=args.similarity)
+    sizes = data['cluster'].map(data['cluster'].value_counts())
+    duplicates = data[sizes > 1].sort_values(['cluster', 'brand'])
+    print(f"[NEAR DUP] 전체 {len(data)}행 -> 매장 {data['cluster'].nunique()}개 "
+          f"(중복 묶음 {duplicates['cluster'].nunique()}개, {len(duplicates)}행)")
+    duplicates.to_csv(args.out, index=False, encoding="utf-8-sig")
+    print(f"[NEAR DUP] {args.out} 저장")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,177 @@
+import os
+import queue
+import sqlite3
+import threading
+import time
+
+import pandas as pd
+
+# 카카오 키워드 검색 document 필드(응답 순서) + 검색 keyword
+PLACE_COLUMNS = [
+    'address_name', 'category_group_code', 'category_group_name', 'category_name', 'distance', 'id',
+    'phone', 'place_name', 'place_url', 'road_address_name', 'x', 'y', 'keyword',
+]
+
+
+class PlaceStore:
+    """
+    수집 결과 저장소 (SQLite).
+    - (brand, id) 기본키로 upsert -> 브랜드 파일 전체를 읽고/합치고/다시 쓰는 작업이 없음
+    - save() 는 큐에 넣고 바로 반환, 별도 writer 스레드가 모아서 기록 (수집 스레드가 디스크 I/O 를 기다리지 않음)
+    - brand_done 테이블로 완료 브랜드 목록 조회 (파일 glob 불필요)
+    """
+
+    def __init__(self, path='./save_data/places.sqlite', batch_seconds=1.0):
+        dir_name = os.path.dirname(path)
+        if dir_name:
+            os.makedirs(dir_name, exist_ok=True)
+        self.path = path
+        self.batch_seconds = batch_seconds
+        self.lock = threading.Lock()
+        self.conn = self._connect()
+        self._create_tables(self.conn)
+
+        self.queue = queue.Queue()
+        self.error = None
+        self.writer = threading.Thread(target=self._writer_loop, daemon=True)
+        self.writer.start()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, check_same_thread=False, timeout=60)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    @staticmethod
+    def _create_tables(conn):
+        columns = ', '.join(f"{c} TEXT" for c in PLACE_COLUMNS if c != 'id')
+        conn.execute(
+            f"""
+            CREATE TABLE IF NOT EXISTS place (
+                brand TEXT NOT NULL,
+                id TEXT NOT NULL,
+                {columns},
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (brand, id)
+            )
+            """
+        )
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS brand_done (
+                brand TEXT PRIMARY KEY,
+                rows INTEGER NOT NULL,
+                updated_at REAL NOT NULL
+            )
+            """
+        )
+        conn.commit()
+
+    def save(self, brand, data, on_saved=None):
+        """
+        브랜드 수집 결과(DataFrame)를 저장 큐에 추가하고 완료 처리. on_saved: 실제 기록 후 호출할 함수
+        """
+        self.upsert(brand, data)
+        self.mark_done(brand, len(data), on_saved)
+
+    def upsert(self, brand, data, on_saved=None):
+        """
+        수집 도중의 일부 결과(batch) 저장 -> 브랜드 완료 처리는 하지 않음. on_saved: 기록 후 writer 스레드에서 호출
+        """
+        if self.error is not None:
+            raise self.error
+        self.queue.put((brand, data, None, on_saved))
+
+    def mark_done(self, brand, rows, on_saved=None):
+        if self.error is not None:
+            raise self.error
+        self.queue.put((brand, None, rows, on_saved))
+
+    def _rows(self, brand, data, now):
+        if len(data) == 0 or 'id' not in data.columns:
+            return []
+        frame = data.reindex(columns=PLACE_COLUMNS)
+        frame = frame.astype(object).where(frame.notna(), None)
+        frame['id'] = frame['id'].astype(str)
+        return [(brand, *row, now) for row in frame.itertuples(index=False, name=None)]
+
+    def _writer_loop(self):
+        conn = self._connect()
+        names = ', '.join(PLACE_COLUMNS)
+        marks = ', '.join('?' for _ in PLACE_COLUMNS)
+        updates = ', '.join(f"{c} = excluded.{c}" for c in PLACE_COLUMNS if c != 'id')
+        upsert = (f"INSERT INTO place (brand, {names}, updated_at) VALUES (?, {marks}, ?) "
+                  f"ON CONFLICT(brand, id) DO UPDATE SET {updates}, updated_at = excluded.updated_at")
+
+        while True:
+            item = self.queue.get()
+            if item is None:
+                self.queue.task_done()
+                break
+            # 짧은 시간 동안 들어온 저장 요청을 한 트랜잭션으로 묶음
+            items = [item]
+            deadline = time.monotonic() + self.batch_seconds
+            stop = False
+            while time.monotonic() < deadline:
+                try:
+                    item = self.queue.get(timeout=max(deadline - time.monotonic(), 0))
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                items.append(item)
+
+            try:
+                now = time.time()
+                with conn:
+                    for brand, data, done_rows, _ in items:
+                        if data is not None:
+                            conn.executemany(upsert, self._rows(brand, data, now))
+                        if done_rows is not None:
+                            conn.execute(
+                                "INSERT OR REPLACE INTO brand_done (brand, rows, updated_at) VALUES (?, ?, ?)",
+                                (brand, done_rows, now),
+                            )
+                for brand, _, _, on_saved in items:
+                    if on_saved is not None:
+                        on_saved(brand)
+            except Exception as e:
+                print(f"[STORE ERROR] {e}")
+                self.error = e
+            finally:
+                for _ in items:
+                    self.queue.task_done()
+                if stop:
+                    self.queue.task_done()
+            if stop:
+                break
+        conn.close()
+
+    def flush(self):
+        """
+        큐에 쌓인 저장 요청이 모두 기록될 때까지 대기
+        """
+        self.queue.join()
+
+    def close(self):
+        self.queue.put(None)
+        self.writer.join()
+
+    def done_brands(self):
+        with self.lock:
+            return [row[0] for row in self.conn.execute("SELECT brand FROM brand_done")]
+
+    def done_times(self):
+        """
+        브랜드별 마지막 완료 시각 / 행 수 -> {brand: (updated_at, rows)}
+        """
+        with self.lock:
+            return {brand: (updated_at, rows) for brand, rows, updated_at
+                    in self.conn.execute("SELECT brand, rows, updated_at FROM brand_done")}
+
+    def load_brand(self, brand):
+        with self.lock:
+            return pd.read_sql_query(
+                f"SELECT {', '.join(PLACE_COLUMNS)} FROM place WHERE brand = ?", self.conn, params=(brand,)
+            )
@@ -0,0 +1,168 @@
+import contextlib
+import os
+import socket
+import sqlite3
+import threading
+import time
+
+
+class BrandWorkQueue:
+    """
+    여러 프로세스 / 서버가 함께 쓰는 브랜드 작업 큐 (SQLite 파일).
+    - lease(): 대기 중인 브랜드를 lease_seconds 동안 점유. 점유 중인 워커는 renew() 로 주기적으로 연장
+    - 워커가 죽어 연장이 끊긴 브랜드는 lease 만료 후 다른 워커가 자동으로 가져감
+    - complete() / fail() 로 결과 기록, 실패는 max_attempts 번까지 다시 대기열로
+    여러 서버에서 쓰는 경우 같은 파일을 공유 디스크(NFS 등 잠금을 지원하는 곳)에 두어야 한다.
+    """
+
+    def __init__(self, path='./cache/work_queue.sqlite', lease_seconds=300, max_attempts=3):
+        dir_name = os.path.dirname(path)
+        if dir_name:
+            os.makedirs(dir_name, exist_ok=True)
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.lock = threading.Lock()
+        # 쓰기 트랜잭션은 BEGIN IMMEDIATE 로 직접 시작 (autocommit 모드)
+        self.conn = sqlite3.connect(path, check_same_thread=False, timeout=60, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS work (
+                brand TEXT PRIMARY KEY,
+                target_index INTEGER NOT NULL,
+                state TEXT NOT NULL,
+                worker TEXT,
+                lease_until REAL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                error TEXT,
+                updated_at REAL NOT NULL
+            )
+            """
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS work_state ON work (state, target_index)")
+
+    @staticmethod
+    def default_worker_id():
+        return f"{socket.gethostname()}:{os.getpid()}"
+
+    @contextlib.contextmanager
+    def _transaction(self):
+        """
+        쓰기 트랜잭션 (BEGIN IMMEDIATE -> 다른 프로세스와 동시에 같은 브랜드를 가져가지 않음)
+        """
+        with self.lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self.conn
+                self.conn.execute("COMMIT")
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+
+    def fill(self, tasks):
+        """
+        tasks: [(target_index, brand), ...] -> 큐에 없는 브랜드만 추가 (여러 워커가 동시에 호출해도 안전)
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO work (brand, target_index, state, updated_at) VALUES (?, ?, 'pending', ?)",
+                [(brand, int(idx), now) for idx, brand in tasks],
+            )
+
+    def reset(self):
+        """
+        새 수집 주기 시작 -> 모든 브랜드를 다시 대기 상태로
+        """
+        with self._transaction() as conn:
+            conn.execute("UPDATE work SET state = 'pending', worker = NULL, lease_until = NULL, attempts = 0, "
+                         "error = NULL, updated_at = ?", (time.time(),))
+
+    def lease(self, worker_id, n=1):
+        """
+        대기 중이거나 lease 가 만료된 브랜드를 최대 n 개 점유 -> [(target_index, brand), ...]
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            rows = conn.execute(
+                """
+                SELECT brand, target_index, state, worker FROM work
+                WHERE state = 'pending' OR (state = 'leased' AND lease_until < ?)
+                ORDER BY target_index LIMIT ?
+                """,
+                (now, n),
+            ).fetchall()
+            conn.executemany(
+                """
+                UPDATE work SET state = 'leased', worker = ?, lease_until = ?, attempts = attempts + 1,
+                    updated_at = ? WHERE brand = ?
+                """,
+                [(worker_id, now + self.lease_seconds, now, brand) for brand, _, _, _ in rows],
+            )
+        for brand, _, state, old_worker in rows:
+            if state == 'leased':
+                print(f"[LEASE] {brand} lease 만료 ({old_worker}) -> {worker_id} 가 가져감")
+        return [(idx, brand) for brand, idx, _, _ in rows]
+
+    def renew(self, worker_id, brands):
+        """
+        점유 중인 브랜드의 lease 연장 (heartbeat)
+        """
+        if not brands:
+            return
+        now = time.time()
+        with self._transaction() as conn:
+            conn.executemany(
+                "UPDATE work SET lease_until = ?, updated_at = ? WHERE brand = ? AND worker = ? AND state = 'leased'",
+                [(now + self.lease_seconds, now, brand, worker_id) for brand in brands],
+            )
+
+    def complete(self, worker_id, brand):
+        with self._transaction() as conn:
+            conn.execute("UPDATE work SET state = 'done', lease_until = NULL, error = NULL, updated_at = ? "
+                         "WHERE brand = ? AND worker = ?", (time.time(), brand, worker_id))
+
+    def fail(self, worker_id, brand, error):
+        """
+        수집 실패 -> max_attempts 미만이면 다시 대기열로, 아니면 failed
+        """
+        with self._transaction() as conn:
+            conn.execute(
+                """
+                UPDATE work SET state = CASE WHEN attempts < ? THEN 'pending' ELSE 'failed' END,
+                    lease_until = NULL, error = ?, updated_at = ? WHERE brand = ? AND worker = ?
+                """,
+                (self.max_attempts, str(error)[:500], time.time(), brand, worker_id),
+            )
+
+    def release(self, worker_id, brand=None):
+        """
+        점유 중인 브랜드 반납 (키 소진 / 종료 등, brand=None 이면 전부) -> 시도 횟수에 포함하지 않고 대기열로
+        """
+        sql = """
+            UPDATE work SET state = 'pending', worker = NULL, lease_until = NULL,
+                attempts = MAX(attempts - 1, 0), updated_at = ? WHERE worker = ? AND state = 'leased'
+            """
+        params = (time.time(), worker_id)
+        if brand is not None:
+            sql += " AND brand = ?"
+            params += (brand,)
+        with self._transaction() as conn:
+            conn.execute(sql, params)
+
+    def stats(self):
+        with self.lock:
+            rows = self.conn.execute("SELECT state, COUNT(*) FROM work GROUP BY state").fetchall()
+        return dict(rows)
+
+
+def shard_keys(api_keys, worker_index, n_workers):
+    """
+    워커별 API 키 부분집합 (키를 워커 수로 나눠 서로 겹치지 않게)
+    """
+    if n_workers <= 1:
+        return list(api_keys)
+    if len(api_keys) < n_workers:
+        raise ValueError(f"API 키 {len(api_keys)}개를 워커 {n_workers}개로 나눌 수 없음")
+    return list(api_keys)[worker_index::n_workers]
@@ -0,0 +1,51 @@
+"""
+분산 수집 워커. 같은 작업 큐 파일(--queue)을 보는 워커 여러 개가 브랜드를 나눠 수집한다.
+워커마다 --worker-index 를 다르게 주면 API 키도 겹치지 않게 나눠 사용.
+
+python -m collect.worker --worker-index 0 --workers 3 --reset   # 새 수집 주기 시작 (한 워커만 --reset)
+python -m collect.worker --worker-index 1 --workers 3
+python -m collect.worker --worker-index 2 --workers 3
+
+여러 서버에서 실행하는 경우 --queue 와 save_data 를 공유 디스크에 둔다.
+"""
+import argparse
+
+from collect.kakao_api import KakaoAPIManager
+from collect.work_queue import BrandWorkQueue
+
+
+def main():
+    parser = argparse.ArgumentParser(description='작업 큐 기반 분산 수집 워커')
+    parser.add_argument('--queue', default='./cache/work_queue.sqlite')
+    parser.add_argument('--worker-index', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=1, help='전체 워커 수 (API 키 분할 기준)')
+    parser.add_argument('--threads', type=int, default=10, help='워커 내 동시 수집 브랜드 수')
+    parser.add_argument('--lease', type=int, default=300, help='lease 시간(초)')
+    parser.add_argument('--reset', action='store_true', help='모든 브랜드를 다시 대기 상태로 (새 수집 주기)')
+    args = parser.parse_args()
+
+    if args.reset:
+        BrandWorkQueue(args.queue, lease_seconds=args.lease).reset()
+
+    kakao_api = KakaoAPIManager(
+        progress_file_path='./save_data/',
+        cache_path='./cache/kakao_response.sqlite',
+        journal_path='./journal/',
+        key_usage_path='./cache/key_usage.json',
+        recrawl=True,
+        region_history_path='./cache/region_history.sqlite',
+        storage='sqlite',
+        place_index_path='./save_data/place_index.sqlite',
+        metrics_path=f'./cache/metrics.{args.worker_index}.json',
+        key_shard=(args.worker_index, args.workers),
+    )
+    kakao_api.collect_stores_leased(
+        queue_path=args.queue,
+        worker_id=f"{BrandWorkQueue.default_worker_id()}#{args.worker_index}",
+        max_workers=args.threads,
+        lease_seconds=args.lease,
+    )
+
+
+if __name__ == '__main__':
+    main()
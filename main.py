@@ -1,14 +1,36 @@
 from collect.kakao_api import KakaoAPIManager
-import time
 from collect.util import  api_key_check
 
 # api key 등록시 정상적으로 넘어오는지 체크하는 코드
 # api_key_check()
 
-while True:
-    kakao_api = KakaoAPIManager(progress_file_path='./save_data/')
-    kakao_api.collect_stores_in_parallel(max_workers=10)
-    time.sleep(3600*23)
+# 응답 캐시: 20시간 안에 재실행/재시작 시 같은 검색어는 API 호출 없이 재사용
+# 저널: 브랜드 수집 도중 중단(키 소진 등)되어도 재시작 시 완료된 지역부터 이어서 수집
+kakao_api = KakaoAPIManager(
+    progress_file_path='./save_data/',
+    cache_path='./cache/kakao_response.sqlite',
+    journal_path='./journal/',
+    # 키별 일일 사용량 기록 -> 재시작해도 남은 할당량 유지, 모든 키 소진 시 초기화(자정) 후 자동 재개
+    key_usage_path='./cache/key_usage.json',
+    # 매일 전체 브랜드를 갱신하되, 지난 수집에서 결과가 있던 지역만 재검색 (0건 지역은 7일마다 재확인)
+    recrawl=True,
+    region_history_path='./cache/region_history.sqlite',
+    # 브랜드별 csv 재작성 대신 save_data/places.sqlite 에 upsert (writer 스레드가 기록)
+    storage='sqlite',
+    # 전체 매장 id 인덱스 -> 실행마다 신규/폐점/이전 매장만 save_data/diff/*.csv 로 저장
+    place_index_path='./save_data/place_index.sqlite',
+    # 키별 요청 수 / 지연 / 브랜드별 API 비용을 30초마다 cache/metrics.json, cache/metrics.prom 에 기록
+    metrics_path='./cache/metrics.json',
+    # 브랜드 매장 고유 id 가 전국 total_count 만큼 모이면 남은 시도/구/동 검색 생략 (0.0: 전부 받은 경우만)
+    coverage_tolerance=0.0,
+)
+# 23시간 대기 없이 계속 실행: 목표 갱신 주기(신규 가맹/최근 변화 1일, 일반 3일, 0건 14일)가 지난 브랜드부터
+# 우선순위 순으로 (브랜드, 지역, 페이지) 단위 전역 작업 큐로 수집, 남는 할당량은 앞당겨 수집에 사용
+kakao_api.run_forever(max_workers=10)
+# 한 번만 전체 수집
+# kakao_api.collect_stores_queued(max_workers=10)
+# 스레드 대신 asyncio 로 수집 (동시 요청 수를 스레드 수와 무관하게 설정)
+# kakao_api.collect_stores_async(max_in_flight=200)
 
 
 